@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fake_ollama import FakeOllama, FakeOllamaConfig
+
+from openclaw_local.agent import OpenClawAgent
+from openclaw_local.config import AppConfig, ChatStoreConfig, ModelConfig, ToolConfig
+from openclaw_local.ollama_client import OllamaClient
+from openclaw_local.tools import ToolExecutor
+from openclaw_local.ui import ChatStore
+
+Benchmark = Callable[[], None]
+
+
+def measure(operation: Benchmark, repeat: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        operation()
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - begin) * 1000)
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "ops_per_s": round(repeat / elapsed, 2),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    }
+
+
+def _synthetic_tree(root: Path, dirs: int, files_per_dir: int) -> None:
+    body = "lorem ipsum dolor sit amet\n" * 40
+    for index in range(dirs):
+        folder = root / f"dir{index:04d}"
+        folder.mkdir(parents=True)
+        for number in range(files_per_dir):
+            (folder / f"file{number:04d}.txt").write_text(body, encoding="utf-8")
+
+
+def run_suite(repeat: int, scale: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    fake = FakeOllamaConfig(tokens=64)
+    with FakeOllama(fake) as server, tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch)
+        model = ModelConfig(base_url=server.base_url, model="llama3")
+        config = AppConfig(tool=ToolConfig(working_directory=root), model=model)
+        history = [{"role": "user", "content": f"message {n}"} for n in range(50)]
+
+        client = OllamaClient(model)
+        results["ollama_client.chat"] = measure(lambda: client.chat(history), repeat)
+
+        results["agent.ask"] = measure(lambda: OpenClawAgent(config).ask("hello there"), repeat)
+        results["agent.ask_tool_call"] = measure(
+            lambda: OpenClawAgent(config).ask("tool:list_dir"),
+            repeat,
+        )
+
+        _synthetic_tree(root / "tree", dirs=max(1, scale // 10), files_per_dir=100)
+        tools = ToolExecutor(config.tool)
+        big_dir = "tree/dir0000"
+        results["tools.list_dir"] = measure(lambda: tools.list_dir(big_dir), repeat)
+        results["tools.read_file"] = measure(
+            lambda: tools.read_file(f"{big_dir}/file0050.txt"),
+            repeat,
+        )
+        counter = iter(range(10**9))
+        results["tools.write_file"] = measure(
+            lambda: tools.write_file(f"out/{next(counter)}.txt", "x" * 4096),
+            repeat,
+        )
+
+        for label, db_path in (("memory", None), ("sqlite", root / "chats.db")):
+            store = ChatStore(
+                AppConfig(
+                    model=model,
+                    chats=ChatStoreConfig(db_path=db_path, max_live_sessions=64),
+                )
+            )
+            sessions = [store.create_chat(f"Chat {n}", "llama3") for n in range(scale)]
+            for session in sessions:
+                for turn in range(4):
+                    store.append_message(session, "user", f"turn {turn} in {session.title}")
+            probe = sessions[len(sessions) // 2]
+            results[f"chat_store.{label}.list_chats"] = measure(store.list_chats, repeat)
+            results[f"chat_store.{label}.page_messages"] = measure(
+                lambda: store.page_messages(probe, limit=20),
+                repeat,
+            )
+            results[f"chat_store.{label}.create_chat"] = measure(
+                lambda: store.create_chat("Bench", "llama3"),
+                repeat,
+            )
+            store.close()
+    return results
+
+
+def median_of_rounds(rounds: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    # Keep, per benchmark, the round with the median p50 so one noisy round cannot decide.
+    results: Dict[str, Dict[str, float]] = {}
+    for name in rounds[0]:
+        ordered = sorted((run[name] for run in rounds), key=lambda stats: stats["p50_ms"])
+        results[name] = {**ordered[len(ordered) // 2], "rounds": len(ordered)}
+    return results
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    min_delta_ms: float = 0.0,
+) -> List[str]:
+    regressions = []
+    for name, stats in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        limit = previous["p50_ms"] * (1 + tolerance)
+        # Sub-microsecond operations swing by large percentages on timer noise alone.
+        if stats["p50_ms"] > limit and stats["p50_ms"] - previous["p50_ms"] > min_delta_ms:
+            regressions.append(
+                f"{name}: p50 {stats['p50_ms']}ms vs baseline {previous['p50_ms']}ms "
+                f"(+{(stats['p50_ms'] / previous['p50_ms'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenClaw Local micro-benchmarks")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed iterations per benchmark")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Times to run the whole suite; each benchmark reports its median round",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=2000,
+        help="Chat sessions to create; the synthetic file tree scales with it",
+    )
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p50 slowdown before a benchmark counts as a regression",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.05,
+        help="Smallest absolute p50 slowdown that can count as a regression",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results = median_of_rounds(
+        [run_suite(args.repeat, args.scale) for _ in range(max(1, args.rounds))]
+    )
+    for name, stats in results.items():
+        print(f"{name:40s} p50 {stats['p50_ms']:>10.4f} ms  {stats['ops_per_s']:>10.1f} ops/s")
+
+    if args.save:
+        document: Dict[str, Any] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "rounds": max(1, args.rounds),
+            "scale": args.scale,
+            "results": results,
+        }
+        Path(args.save).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+Responder = Callable[[List[Dict[str, Any]]], str]
+
+TOOL_PREFIX = "tool:"
+
+
+def default_responder(tokens: int) -> Responder:
+    def respond(messages: List[Dict[str, Any]]) -> str:
+        last = messages[-1] if messages else {"role": "user", "content": ""}
+        # "tool:<name>" asks for a tool call, so the agent's tool path can be exercised.
+        if last.get("role") == "user" and last.get("content", "").startswith(TOOL_PREFIX):
+            name = last["content"][len(TOOL_PREFIX) :].strip() or "list_dir"
+            return json.dumps({"tool": name, "args": {}})
+        return " ".join(f"token{index}" for index in range(tokens))
+
+    return respond
+
+
+@dataclass(frozen=True)
+class FakeOllamaConfig:
+    models: Tuple[str, ...] = ("llama3", "mistral")
+    tokens: int = 32
+    token_latency_s: float = 0.0
+    load_delay_s: float = 0.0
+    stream_chunk_tokens: int = 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        owner = self.server.owner
+        owner._count("tags" if self.path == "/api/tags" else "other")
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": name} for name in owner.config.models]})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json({"error": "invalid JSON"}, status=400)
+            return
+        if self.path != "/api/chat":
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        owner = self.server.owner
+        owner._count("chat")
+        model = request.get("model", "")
+        if model not in owner.config.models:
+            self._send_json({"error": f"model '{model}' not found"}, status=404)
+            return
+        owner._load(model)
+        content = owner.responder(request.get("messages", []))
+        if request.get("stream", True):
+            self._stream(model, content)
+        else:
+            time.sleep(owner.config.token_latency_s * len(content.split()))
+            self._send_json(
+                {
+                    "model": model,
+                    "message": {"role": "assistant", "content": content},
+                    "done": True,
+                }
+            )
+
+    def _stream(self, model: str, content: str) -> None:
+        config = self.server.owner.config
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = content.split(" ")
+        step = max(1, config.stream_chunk_tokens)
+        for start in range(0, len(words), step):
+            time.sleep(config.token_latency_s * step)
+            piece = " ".join(words[start : start + step])
+            if start + step < len(words):
+                piece += " "
+            self._chunk(model, piece, done=False)
+        self._chunk(model, "", done=True)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, model: str, content: str, done: bool) -> None:
+        payload = {"model": model, "message": {"role": "assistant", "content": content}, "done": done}
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeOllama"
+
+
+class FakeOllama:
+    def __init__(
+        self,
+        config: FakeOllamaConfig = FakeOllamaConfig(),
+        responder: Responder | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config
+        self.responder = responder or default_responder(config.tokens)
+        self._server = _Server((host, port), _Handler)
+        self._server.owner = self
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._loaded: set[str] = set()
+        self.requests: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def _load(self, model: str) -> None:
+        # The first request per model pays the load delay, like a cold Ollama model.
+        with self._lock:
+            cold = model not in self._loaded
+            self._loaded.add(model)
+        if cold and self.config.load_delay_s:
+            time.sleep(self.config.load_delay_s)
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-ollama",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Ollama server for tests and benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--models", default="llama3,mistral", help="Comma-separated model names")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens per reply")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per token")
+    parser.add_argument(
+        "--load-delay",
+        type=float,
+        default=0.0,
+        help="Delay before the first reply for each model",
+    )
+    parser.add_argument(
+        "--stream-chunk-tokens",
+        type=int,
+        default=1,
+        help="Tokens per chunk in streamed replies",
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    config = FakeOllamaConfig(
+        models=tuple(name.strip() for name in args.models.split(",") if name.strip()),
+        tokens=args.tokens,
+        token_latency_s=args.token_latency,
+        load_delay_s=args.load_delay,
+        stream_chunk_tokens=args.stream_chunk_tokens,
+    )
+    server = FakeOllama(config, host=args.host, port=args.port).start()
+    print(f"Fake Ollama listening on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import requests
+from fake_ollama import FakeOllama, FakeOllamaConfig
+
+from openclaw_local.config import AppConfig, ChatStoreConfig, ModelConfig
+from openclaw_local.serving import (
+    add_server_arguments,
+    make_app_server,
+    server_config_from_args,
+    stop_app_server,
+)
+from openclaw_local.ui import create_app, shutdown_app
+
+# Relative weights of what a virtual user does after creating its chat.
+ACTIONS: Tuple[Tuple[str, int], ...] = (
+    ("send_message", 50),
+    ("poll_status", 30),
+    ("load_chat", 15),
+    ("switch_model", 5),
+)
+
+
+@dataclass
+class Recorder:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self.lock:
+            self.latencies[endpoint].append(seconds * 1000)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    endpoints = {}
+    total = errors = 0
+    for endpoint, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        failed = recorder.errors.get(endpoint, 0)
+        total += len(samples)
+        errors += failed
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "rps": round(len(samples) / elapsed, 2),
+            "error_rate": round(failed / len(samples), 4),
+            "p50_ms": round(_percentile(samples, 0.50), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+            "p99_ms": round(_percentile(samples, 0.99), 2),
+        }
+    return {
+        "requests": total,
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+class VirtualUser:
+    def __init__(self, base_url: str, models: List[str], recorder: Recorder, seed: int) -> None:
+        self._base_url = base_url
+        self._models = models
+        self._recorder = recorder
+        self._random = random.Random(seed)
+        self._session = requests.Session()
+        self._chat_id: str | None = None
+
+    def _call(self, endpoint: str, method: str, path: str, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = self._session.request(method, self._base_url + path, timeout=60, **kwargs)
+            ok = response.status_code < 400
+            return response.json() if ok else None
+        except (requests.RequestException, ValueError):
+            return None
+        finally:
+            self._recorder.record(endpoint, time.perf_counter() - started, ok)
+
+    def create_chat(self) -> None:
+        created = self._call("create_chat", "POST", "/api/chats", json={"title": "Load test"})
+        self._chat_id = created["id"] if created else None
+
+    def send_message(self) -> None:
+        self._call(
+            "send_message",
+            "POST",
+            f"/api/chats/{self._chat_id}/messages",
+            json={"message": f"question {self._random.randint(0, 10**6)}", "wait": True},
+        )
+
+    def poll_status(self) -> None:
+        self._call("poll_status", "GET", "/api/status")
+
+    def load_chat(self) -> None:
+        self._call("load_chat", "GET", f"/api/chats/{self._chat_id}?limit=50")
+
+    def switch_model(self) -> None:
+        model = self._random.choice(self._models)
+        path = f"/api/chats/{self._chat_id}/model"
+        self._call("switch_model", "POST", path, json={"model": model})
+
+    def run(self, stop: threading.Event, think_time_s: float) -> None:
+        self.create_chat()
+        names = [name for name, _ in ACTIONS]
+        weights = [weight for _, weight in ACTIONS]
+        while not stop.is_set():
+            if self._chat_id is None:
+                self.create_chat()
+                continue
+            action: Callable[[], None] = getattr(self, self._random.choices(names, weights)[0])
+            action()
+            if think_time_s:
+                stop.wait(self._random.uniform(0, 2 * think_time_s))
+        self._session.close()
+
+
+def run_level(
+    base_url: str,
+    users: int,
+    duration_s: float,
+    models: List[str],
+    think_time_s: float,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=VirtualUser(base_url, models, recorder, seed=index).run,
+            args=(stop, think_time_s),
+            name=f"vu-{index}",
+        )
+        for index in range(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(duration_s)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"users": users, **summarize(recorder, time.perf_counter() - started)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Concurrent load test for the OpenClaw UI API")
+    parser.add_argument("--url", help="Target a running server instead of starting one in-process")
+    parser.add_argument("--users", default="1,4,16,64", help="Comma-separated concurrency sweep")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between actions")
+    parser.add_argument("--tokens", type=int, default=64, help="Fake model reply length")
+    parser.add_argument("--token-latency", type=float, default=0.002, help="Fake seconds per token")
+    parser.add_argument(
+        "--stream-chunk-tokens",
+        type=int,
+        default=1,
+        help="Tokens per chunk in the fake model's streamed replies",
+    )
+    parser.add_argument("--json", help="Also write the sweep results to this file")
+    add_server_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    levels = [int(value) for value in args.users.split(",") if value.strip()]
+    models = ["llama3", "mistral"]
+    fake = server = app = None
+    base_url = args.url
+    if base_url is None:
+        fake = FakeOllama(
+            FakeOllamaConfig(
+                models=tuple(models),
+                tokens=args.tokens,
+                token_latency_s=args.token_latency,
+                stream_chunk_tokens=args.stream_chunk_tokens,
+            )
+        ).start()
+        app = create_app(
+            AppConfig(
+                model=ModelConfig(base_url=fake.base_url, model=models[0]),
+                chats=ChatStoreConfig(db_path=None),
+            )
+        )
+        server = make_app_server("127.0.0.1", 0, app, server_config_from_args(args))
+        threading.Thread(target=server.serve_forever, name="http-accept", daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    sweep = []
+    try:
+        for users in levels:
+            result = run_level(base_url, users, args.duration, models, args.think_time)
+            sweep.append(result)
+            print(
+                f"users={users:<4d} rps={result['rps']:<9} errors={result['error_rate']:.2%}",
+                flush=True,
+            )
+            for endpoint, stats in result["endpoints"].items():
+                print(
+                    f"    {endpoint:14s} n={stats['requests']:<7d} "
+                    f"p50={stats['p50_ms']:>8.2f}ms p95={stats['p95_ms']:>8.2f}ms "
+                    f"p99={stats['p99_ms']:>8.2f}ms err={stats['error_rate']:.2%}",
+                    flush=True,
+                )
+    finally:
+        if server is not None:
+            stop_app_server(server)
+        if app is not None:
+            shutdown_app(app)
+        if fake is not None:
+            fake.stop()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"levels": sweep}, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict
 
 import requests
 
 from openclaw_local.config import AppConfig
+from openclaw_local.messages import CONTEXT, VISIBLE, MessageLog
+from openclaw_local.metrics import INTENT_MATCH_SECONDS
 from openclaw_local.ollama_client import OllamaClient
+from openclaw_local.profiles import get_profile
 from openclaw_local.tools import ToolExecutor
+from openclaw_local.tracing import TRACER
 
 SYSTEM_PROMPT = """
 You are OpenClaw Local, a local-first assistant running on the user's Windows PC.
@@ -32,15 +37,30 @@ Available tools and arguments:
 If no tool is required, respond normally.
 """.strip()
 
+UNREACHABLE_REPLY = (
+    "I'm unable to reach the local model right now. "
+    "Please try again after confirming Ollama is running."
+)
+
 
 class OpenClawAgent:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        log: MessageLog | None = None,
+        affinity: str | None = None,
+    ) -> None:
         self._config = config
-        self._client = OllamaClient(config.model)
+        self._client = OllamaClient(config.model, affinity=affinity)
+        self._profile = get_profile(config.model.profile)
         self._tools = ToolExecutor(config.tool)
-        self._messages: List[Dict[str, Any]] = [
-            {"role": "system", "content": SYSTEM_PROMPT}
-        ]
+        self._log = log if log is not None else MessageLog()
+        # Set when the last ask() could not get a real answer from the model.
+        self.last_error: str | None = None
+
+    @property
+    def log(self) -> MessageLog:
+        return self._log
 
     def _try_parse_tool_call(self, content: str) -> Dict[str, Any] | None:
         try:
@@ -56,8 +76,10 @@ class OpenClawAgent:
         return payload
 
     def _append_tool_result(self, tool: str, result: str) -> None:
-        self._messages.append(
-            {"role": "assistant", "content": json.dumps({"tool": tool, "result": result})}
+        self._log.append(
+            "assistant",
+            json.dumps({"tool": tool, "result": result}),
+            flags=CONTEXT,
         )
 
 
@@ -86,19 +108,35 @@ class OpenClawAgent:
 
         return None
 
+    def _reply(self, content: str, flags: int = VISIBLE | CONTEXT) -> str:
+        self._log.append("assistant", content, flags=flags)
+        return content
+
     def ask(self, text: str) -> str:
+        with TRACER.span("agent.ask", model=self._config.model.model):
+            return self._ask(text)
+
+    def _ask(self, text: str) -> str:
+        self.last_error = None
+        started = time.perf_counter()
         direct = self._direct_tool_intent(text)
+        INTENT_MATCH_SECONDS.observe(
+            time.perf_counter() - started,
+            matched=str(direct is not None).lower(),
+        )
         if direct is not None:
-            return direct
+            self._log.append("user", text, flags=VISIBLE)
+            return self._reply(direct, flags=VISIBLE)
 
-        self._messages.append({"role": "user", "content": text})
+        self._log.append("user", text)
         try:
-            response = self._client.chat(self._messages)
-        except requests.RequestException as exc:
-            return (
-                "I'm unable to reach the local model right now. "
-                "Please try again after confirming Ollama is running."
+            response = self._client.chat(
+                self._log.context(SYSTEM_PROMPT),
+                options=self._profile.options(),
             )
+        except requests.RequestException as exc:
+            self.last_error = f"Model unreachable: {exc}"
+            return self._reply(UNREACHABLE_REPLY, flags=VISIBLE)
         content = response["message"]["content"]
         tool_call = self._try_parse_tool_call(content)
         if tool_call:
@@ -106,12 +144,18 @@ class OpenClawAgent:
             result = self._tools.execute(tool_name, tool_call.get("args", {}))
             self._append_tool_result(tool_name, result.output)
             try:
-                follow_up = self._client.chat(self._messages)
-            except requests.RequestException:
-                return result.output
-            return follow_up["message"]["content"]
-        self._messages.append({"role": "assistant", "content": content})
-        return content
+                follow_up = self._client.chat(
+                    self._log.context(SYSTEM_PROMPT),
+                    options=self._profile.tightened().options(),
+                )
+            except requests.RequestException as exc:
+                self.last_error = f"Tool follow-up failed: {exc}"
+                return self._reply(result.output, flags=VISIBLE)
+            return self._reply(follow_up["message"]["content"])
+        return self._reply(content)
 
     def status(self) -> Dict[str, Any]:
         return self._client.status()
+
+    def load_model(self) -> None:
+        self._client.load_model()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib
+from dataclasses import dataclass, field
+from typing import Dict
+
+from flask import Request, Response
+
+
+def _brotli_compress(body: bytes) -> bytes | None:
+    if importlib.util.find_spec("brotli") is None:
+        return None
+    brotli = importlib.import_module("brotli")
+    return brotli.compress(body, quality=11)
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    body: bytes
+    content_type: str
+    digest: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+    cache_control: str = "no-cache"
+
+    @classmethod
+    def build(
+        cls,
+        text: str,
+        content_type: str = "text/html; charset=utf-8",
+        cache_control: str = "no-cache",
+    ) -> "StaticAsset":
+        body = text.encode("utf-8")
+        variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        compressed = _brotli_compress(body)
+        if compressed is not None:
+            variants["br"] = compressed
+        return cls(
+            body=body,
+            content_type=content_type,
+            digest=hashlib.sha256(body).hexdigest()[:32],
+            variants={k: v for k, v in variants.items() if len(v) < len(body)},
+            cache_control=cache_control,
+        )
+
+    def etag(self, encoding: str | None) -> str:
+        return self.digest if encoding is None else f"{self.digest}-{encoding}"
+
+    def negotiate(self, request: Request) -> str | None:
+        accepted = request.accept_encodings
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted[encoding] > 0:
+                return encoding
+        return None
+
+    def response(self, request: Request) -> Response:
+        encoding = self.negotiate(request)
+        etag = self.etag(encoding)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = self.body if encoding is None else self.variants[encoding]
+            response = Response(body, content_type=self.content_type)
+            if encoding is not None:
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = self.cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+
+from openclaw_local.agent import OpenClawAgent
+from openclaw_local.config import AppConfig
+from openclaw_local.messages import MessageLog
+
+AgentFactory = Callable[[AppConfig, MessageLog], Any]
+
+
+def read_prompts(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    # Accepts {"id": ..., "prompt": ...} objects, bare JSON strings or plain text lines.
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            item = line
+        if isinstance(item, dict):
+            prompt = item.get("prompt")
+            if not isinstance(prompt, str):
+                raise ValueError(f"Line {number}: expected a string 'prompt' field")
+            yield str(item.get("id", number)), prompt
+        elif isinstance(item, str):
+            yield str(number), item
+        else:
+            raise ValueError(f"Line {number}: expected an object or a string")
+
+
+def completed_ids(path: Path) -> Set[str]:
+    done: Set[str] = set()
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a truncated last line.
+                continue
+            if isinstance(record, dict) and record.get("ok"):
+                done.add(str(record.get("id")))
+    return done
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(-1, 2)
+        return handle.read(1) == b"\n"
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class BatchSummary:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        total = self.completed + self.failed
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "prompts_per_s": round(total / self.elapsed_s, 3) if self.elapsed_s else 0.0,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 0.50), 3),
+                "p95": round(_percentile(latencies, 0.95), 3),
+                "p99": round(_percentile(latencies, 0.99), 3),
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
+
+
+def _answer(
+    config: AppConfig,
+    factory: AgentFactory,
+    prompt_id: str,
+    prompt: str,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    record: Dict[str, Any] = {"id": prompt_id, "prompt": prompt}
+    try:
+        # Each prompt is its own conversation, so nothing leaks between them.
+        agent = factory(config, MessageLog())
+        record["response"] = agent.ask(prompt)
+        error = agent.last_error
+        record["ok"] = error is None
+        if error is not None:
+            record["error"] = error
+    except Exception as exc:
+        record["response"] = None
+        record["ok"] = False
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return record
+
+
+def run_batch(
+    config: AppConfig,
+    prompts: Iterable[Tuple[str, str]],
+    output: TextIO,
+    concurrency: int = 4,
+    skip: Set[str] | None = None,
+    agent_factory: AgentFactory = OpenClawAgent,
+) -> BatchSummary:
+    summary = BatchSummary()
+    skip = skip or set()
+    concurrency = max(1, concurrency)
+    started = time.perf_counter()
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            record = future.result()
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            if record["ok"]:
+                summary.completed += 1
+            else:
+                summary.failed += 1
+            summary.latencies_ms.append(record["latency_ms"])
+
+    # Only a bounded window of prompts is in flight, so the input is streamed rather
+    # than loaded whole; results are written from this thread in completion order.
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        in_flight: Set[Future] = set()
+        for prompt_id, prompt in prompts:
+            if prompt_id in skip:
+                summary.skipped += 1
+                continue
+            if len(in_flight) >= concurrency * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(_answer, config, agent_factory, prompt_id, prompt))
+        collect(wait(in_flight).done)
+
+    summary.elapsed_s = time.perf_counter() - started
+    return summary
+
+
+def main_batch(config: AppConfig, args: Any) -> BatchSummary:
+    output_path = Path(args.output)
+    skip = completed_ids(output_path) if args.resume else set()
+    mode = "a" if args.resume else "w"
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        with output_path.open(mode, encoding="utf-8") as output:
+            if args.resume and output.tell() > 0 and not _ends_with_newline(output_path):
+                output.write("\n")
+            summary = run_batch(
+                config,
+                read_prompts(source),
+                output,
+                concurrency=args.concurrency,
+                skip=skip,
+            )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(json.dumps(summary.to_dict(), indent=2), file=sys.stderr)
+    return summary
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Tuple
 
 
 @dataclass(frozen=True)
@@ -18,9 +19,46 @@ class ModelConfig:
     base_url: str = "http://localhost:11434"
     model: str = "llama3"
     request_timeout_s: int = 120
+    profile: str = "balanced"
+    # Extra Ollama nodes; when set, requests are routed across base_url and these.
+    base_urls: Tuple[str, ...] = ()
+
+    @property
+    def backends(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys((self.base_url, *self.base_urls)))
+
+
+DEFAULT_DB_PATH = Path.home() / ".openclaw_local" / "chats.db"
+
+
+@dataclass(frozen=True)
+class ChatStoreConfig:
+    db_path: Path | None = None
+    max_concurrent_turns: int = 4
+    max_live_sessions: int = 64
+    idle_timeout_s: float | None = 30 * 60
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    mode: str = "pool"
+    threads: int = 16
+    queue_size: int = 64
+    keep_alive_s: float = 5.0
+    drain_timeout_s: float = 10.0
+
+
+@dataclass(frozen=True)
+class DiagnosticsConfig:
+    trace: bool = False
+    trace_buffer: int = 200
+    profile_every: int = 0
+    profile_dir: Path = Path("profiles")
 
 
 @dataclass(frozen=True)
 class AppConfig:
     tool: ToolConfig = ToolConfig()
     model: ModelConfig = ModelConfig()
+    chats: ChatStoreConfig = ChatStoreConfig()
+    diagnostics: DiagnosticsConfig = DiagnosticsConfig()
@@ -1,59 +1,242 @@
 from __future__ import annotations
 
 import argparse
+import html
 import importlib
+import json
+import sys
 import threading
 import time
-from wsgiref.simple_server import WSGIServer
-
-from werkzeug.serving import make_server
-
-from openclaw_local.config import AppConfig, ModelConfig
-from openclaw_local.ui import create_app
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from openclaw_local.config import (
+    DEFAULT_DB_PATH,
+    AppConfig,
+    ChatStoreConfig,
+    ModelConfig,
+    ServerConfig,
+)
+from openclaw_local.profiles import DEFAULT_PROFILE, PROFILES
+from openclaw_local.serving import (
+    add_server_arguments,
+    make_app_server,
+    server_config_from_args,
+    stop_app_server,
+    wait_until_listening,
+)
+from openclaw_local.tasks import Task, TaskResult, TaskRunner
+from openclaw_local.tracing import add_diagnostics_arguments, diagnostics_config_from_args
+
+if TYPE_CHECKING:
+    from werkzeug.serving import BaseWSGIServer
+
+    from openclaw_local.ui import ChatStore
+
+
+SPLASH_HTML = """<!doctype html>
+<html><body style="margin:0;height:100vh;display:flex;align-items:center;justify-content:center;
+background:#0f1115;color:#e6e8ee;font-family:Segoe UI,Arial,sans-serif;">
+<div style="text-align:center;"><h2 style="margin:0 0 8px;">OpenClaw Local</h2>
+<div style="color:#9aa3b2;">__MESSAGE__</div></div></body></html>"""
 
 
 class ServerThread(threading.Thread):
-    def __init__(self, host: str, port: int, app) -> None:
+    def __init__(self, host: str, port: int, app, config: ServerConfig | None = None) -> None:
         super().__init__(daemon=True)
-        self._server: WSGIServer = make_server(host, port, app)
+        self._host = host
+        self._server: BaseWSGIServer = make_app_server(host, port, app, config or ServerConfig())
+        self.ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        host = "127.0.0.1" if self._host in ("", "0.0.0.0") else self._host
+        return f"http://{host}:{self._server.server_port}"
 
     def run(self) -> None:
+        self.ready.set()
         self._server.serve_forever()
 
+    def wait_ready(self, timeout_s: float = 10.0) -> bool:
+        started = time.monotonic()
+        if not self.ready.wait(timeout_s):
+            return False
+        remaining = max(0.0, timeout_s - (time.monotonic() - started))
+        return wait_until_listening(self._host, self._server.server_port, remaining)
+
     def shutdown(self) -> None:
-        self._server.shutdown()
+        stop_app_server(self._server)
+
+
+class StartupTimer:
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.warmup: List[TaskResult] = []
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = round((time.perf_counter() - self._started) * 1000, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": max(self.marks.values(), default=0.0),
+            "marks_ms": self.marks,
+            "warmup": [
+                {
+                    "name": result.name,
+                    "status": result.status,
+                    "duration_ms": round(result.duration_ms, 1),
+                    "error": result.error,
+                }
+                for result in self.warmup
+            ],
+        }
+
+
+def warm_up(store: ChatStore) -> List[TaskResult]:
+    # The status check opens the Ollama connection and caches the model catalog for the
+    # page's first poll; loading the default model runs alongside it.
+    runner = TaskRunner(
+        [
+            Task(name="ollama-status", action=store.status),
+            Task(name="load-default-model", action=store.load_default_model),
+        ],
+        max_workers=2,
+    )
+    return runner.run_all()
+
+
+def write_startup_report(timer: StartupTimer, path: str | None) -> None:
+    report = json.dumps(timer.to_dict(), indent=2)
+    if path:
+        Path(path).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report, file=sys.stderr)
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenClaw Local Desktop App")
     parser.add_argument("--model", default="llama3", help="Ollama model name")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Default generation profile (context size, output length, temperature)",
+    )
     parser.add_argument("--base-url", default="http://localhost:11434", help="Ollama base URL")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        default=[],
+        help="Another Ollama base URL to load-balance across (repeatable)",
+    )
     parser.add_argument("--host", default="127.0.0.1", help="Bind host")
     parser.add_argument("--port", type=int, default=8080, help="Bind port")
+    parser.add_argument("--db-path", default=str(DEFAULT_DB_PATH), help="Chat history database")
+    parser.add_argument(
+        "--no-persist",
+        action="store_true",
+        help="Keep chats in memory only",
+    )
+    parser.add_argument(
+        "--max-live-sessions",
+        type=int,
+        default=ChatStoreConfig().max_live_sessions,
+        help="Chats kept in memory before the least recently used are evicted",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=ChatStoreConfig().idle_timeout_s,
+        help="Seconds before an idle chat is evicted from memory (0 disables)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        help="Write startup timings as JSON to this file instead of stderr",
+    )
+    add_server_arguments(parser)
+    add_diagnostics_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
+    timer = StartupTimer()
     args = parse_args()
 
     if importlib.util.find_spec("webview") is None:
         raise RuntimeError("pywebview is required for desktop app mode. Install requirements.txt")
 
     webview = importlib.import_module("webview")
+    timer.mark("webview_imported")
+
+    config = AppConfig(
+        model=ModelConfig(
+            base_url=args.base_url,
+            model=args.model,
+            base_urls=tuple(args.backend),
+            profile=args.profile,
+        ),
+        chats=ChatStoreConfig(
+            db_path=None if args.no_persist else Path(args.db_path),
+            max_live_sessions=args.max_live_sessions,
+            idle_timeout_s=args.idle_timeout or None,
+        ),
+        diagnostics=diagnostics_config_from_args(args),
+    )
+    # The window opens on a splash page straight away. Flask and the UI module are imported
+    # behind it, and the window switches to the app once the server socket accepts connections.
+    window = webview.create_window(
+        "OpenClaw Local",
+        html=SPLASH_HTML.replace("__MESSAGE__", "Starting…"),
+        width=1280,
+        height=800,
+    )
+    running: Dict[str, Any] = {}
+
+    def on_started() -> None:
+        timer.mark("window_shown")
+        try:
+            from openclaw_local.ui import create_app
+
+            app = running["app"] = create_app(config)
+            timer.mark("app_created")
+            server = running["server"] = ServerThread(
+                args.host,
+                args.port,
+                app,
+                server_config_from_args(args),
+            )
+        except Exception as exc:
+            message = html.escape(f"OpenClaw Local failed to start: {exc}")
+            window.load_html(SPLASH_HTML.replace("__MESSAGE__", message))
+            raise
+        server.start()
+        warmup = threading.Thread(
+            target=lambda: timer.warmup.extend(warm_up(app.extensions["openclaw_store"])),
+            name="startup-warmup",
+            daemon=True,
+        )
+        warmup.start()
+
+        if not server.wait_ready():
+            window.load_html(SPLASH_HTML.replace("__MESSAGE__", "The local server did not start."))
+            return
+        timer.mark("server_ready")
+        window.load_url(server.url)
+        timer.mark("page_requested")
+        warmup.join()
+        timer.mark("warmup_done")
+        write_startup_report(timer, args.startup_report)
 
-    config = AppConfig(model=ModelConfig(base_url=args.base_url, model=args.model))
-    app = create_app(config)
-
-    server = ServerThread(args.host, args.port, app)
-    server.start()
-    time.sleep(0.5)
-
-    url = f"http://{args.host}:{args.port}"
     try:
-        webview.create_window("OpenClaw Local", url, width=1280, height=800)
-        webview.start()
+        webview.start(on_started)
     finally:
-        server.shutdown()
+        if "server" in running:
+            running["server"].shutdown()
+        if "app" in running:
+            from openclaw_local.ui import shutdown_app
+
+            shutdown_app(running["app"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = {DONE, FAILED, CANCELLED}
+
+
+@dataclass
+class Job:
+    job_id: str
+    key: str
+    fn: Callable[[], Any] = field(repr=False)
+    status: str = QUEUED
+    result: Any = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    context: contextvars.Context = field(default_factory=contextvars.copy_context, repr=False)
+    _done: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "key": self.key,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    def __init__(self, max_workers: int = 4, max_finished: int = 1000) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: Dict[str, Deque[Job]] = {}
+        self._active: set[str] = set()
+        self._closed = False
+
+    def submit(self, key: str, fn: Callable[[], Any]) -> Job:
+        job = Job(job_id=uuid.uuid4().hex, key=key, fn=fn)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Job queue is shut down")
+            self._jobs[job.job_id] = job
+            self._pending.setdefault(key, deque()).append(job)
+            if key not in self._active:
+                self._active.add(key)
+                self._executor.submit(self._run_next, key)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def depth(self) -> int:
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
+
+    def running(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == RUNNING)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            pending = self._pending.get(job.key)
+            if pending is not None and job in pending:
+                pending.remove(job)
+            self._finish(job, CANCELLED)
+        return True
+
+    def _run_next(self, key: str) -> None:
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending:
+                self._pending.pop(key, None)
+                self._active.discard(key)
+                return
+            job = pending.popleft()
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        try:
+            result = job.context.run(job.fn)
+        except Exception as exc:
+            with self._lock:
+                job.error = f"{type(exc).__name__}: {exc}"
+                self._finish(job, FAILED)
+        else:
+            with self._lock:
+                job.result = result
+                self._finish(job, DONE)
+
+        # Requeue rather than loop so a busy chat cannot starve the others.
+        with self._lock:
+            if self._closed:
+                self._active.discard(key)
+                return
+            self._executor.submit(self._run_next, key)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job._done.set()
+        self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            self._closed = True
+            for pending in self._pending.values():
+                while pending:
+                    self._finish(pending.popleft(), CANCELLED)
+        self._executor.shutdown(wait=wait)
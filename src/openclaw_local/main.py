@@ -2,27 +2,75 @@ from __future__ import annotations
 
 import argparse
 
-from openclaw_local.agent import OpenClawAgent
 from openclaw_local.config import AppConfig, ModelConfig
+from openclaw_local.profiles import DEFAULT_PROFILE, PROFILES
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenClaw Local CLI")
     parser.add_argument("--model", default="llama3", help="Ollama model name")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Default generation profile (context size, output length, temperature)",
+    )
     parser.add_argument(
         "--base-url",
         default="http://localhost:11434",
         help="Ollama base URL",
     )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        default=[],
+        help="Another Ollama base URL to load-balance across (repeatable)",
+    )
+    commands = parser.add_subparsers(dest="command")
+    batch = commands.add_parser("batch", help="Answer prompts from a JSONL file or stdin")
+    batch.add_argument(
+        "--input",
+        default="-",
+        help="JSONL prompts ({'id', 'prompt'} objects or strings); '-' reads stdin",
+    )
+    batch.add_argument("--output", required=True, help="JSONL file results are appended to")
+    batch.add_argument("--concurrency", type=int, default=4, help="Prompts answered in parallel")
+    batch.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip prompts that already have a successful result in --output",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    config = AppConfig(model=ModelConfig(base_url=args.base_url, model=args.model))
-    agent = OpenClawAgent(config)
+    config = AppConfig(
+        model=ModelConfig(
+            base_url=args.base_url,
+            model=args.model,
+            base_urls=tuple(args.backend),
+            profile=args.profile,
+        )
+    )
+    if config.model.base_urls:
+        # There is no scheduler in the CLI, so check the backends once to learn their models.
+        from openclaw_local.router import router_for
+
+        router_for(config.model.backends).refresh()
+
+    # The agent pulls in requests and the tool layer, so it is imported only once the
+    # arguments are known to be valid; --help and usage errors return immediately.
+    if args.command == "batch":
+        from openclaw_local.batch import main_batch
+
+        main_batch(config, args)
+        return
 
     print("OpenClaw Local (type 'exit' to quit)")
+    from openclaw_local.agent import OpenClawAgent
+
+    agent = OpenClawAgent(config)
     while True:
         prompt = input("> ").strip()
         if prompt.lower() in {"exit", "quit"}:
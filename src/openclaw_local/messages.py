@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+ROLES: Tuple[str, ...] = ("system", "user", "assistant", "tool")
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+VISIBLE = 1
+CONTEXT = 2
+DEFAULT_FLAGS = VISIBLE | CONTEXT
+
+Record = Tuple[str, str, int]
+AppendListener = Callable[[int, str, str, int], None]
+
+
+class MessageLog:
+    __slots__ = ("_roles", "_flags", "_contents", "_lock", "context_start", "listener")
+
+    def __init__(self, records: Iterable[Record] = (), context_start: int = 0) -> None:
+        self._roles = array("B")
+        self._flags = array("B")
+        self._contents: List[str] = []
+        self._lock = threading.Lock()
+        self.context_start = context_start
+        self.listener: AppendListener | None = None
+        for role, content, flags in records:
+            self._roles.append(_ROLE_CODES[role])
+            self._flags.append(flags)
+            self._contents.append(content)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def append(self, role: str, content: str, flags: int = DEFAULT_FLAGS) -> int:
+        code = _ROLE_CODES[role]
+        with self._lock:
+            seq = len(self._contents)
+            self._roles.append(code)
+            self._flags.append(flags)
+            self._contents.append(content)
+        if self.listener is not None:
+            self.listener(seq, role, content, flags)
+        return seq
+
+    def reset_context(self) -> None:
+        with self._lock:
+            self.context_start = len(self._contents)
+
+    def _snapshot(self, start: int, stop: int | None) -> Iterator[Tuple[str, str, int]]:
+        # The log is append-only, so records below the length read here never change.
+        with self._lock:
+            length = len(self._contents)
+        stop = length if stop is None else min(stop, length)
+        roles, flags, contents = self._roles, self._flags, self._contents
+        for index in range(max(0, start), stop):
+            yield ROLES[roles[index]], contents[index], flags[index]
+
+    def visible(self, start: int = 0, stop: int | None = None) -> List[Dict[str, str]]:
+        return [
+            {"role": role, "content": content}
+            for role, content, flags in self._snapshot(start, stop)
+            if flags & VISIBLE
+        ]
+
+    def last_visible(
+        self, limit: int, stop: int | None = None
+    ) -> Tuple[int, List[Dict[str, str]]]:
+        # Walks back from stop until the page holds `limit` visible messages, however many
+        # hidden records sit between them, and returns the seq the page starts at.
+        with self._lock:
+            length = len(self._contents)
+        index = length if stop is None else min(max(0, stop), length)
+        page: List[Dict[str, str]] = []
+        while index > 0 and len(page) < limit:
+            index -= 1
+            if self._flags[index] & VISIBLE:
+                page.append({"role": ROLES[self._roles[index]], "content": self._contents[index]})
+        page.reverse()
+        return index, page
+
+    def context(self, system_prompt: str | None = None) -> "ContextView":
+        return ContextView(self, system_prompt)
+
+
+class ContextView:
+    __slots__ = ("_log", "_system_prompt")
+
+    def __init__(self, log: MessageLog, system_prompt: str | None) -> None:
+        self._log = log
+        self._system_prompt = system_prompt
+
+    def _records(self) -> Iterator[Tuple[str, str]]:
+        if self._system_prompt is not None:
+            yield "system", self._system_prompt
+        for role, content, flags in self._log._snapshot(self._log.context_start, None):
+            if flags & CONTEXT:
+                yield role, content
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for role, content in self._records():
+            yield {"role": role, "content": content}
+
+    def json_chunks(self) -> Iterator[str]:
+        for role, content in self._records():
+            yield f'{{"role": "{role}", "content": {json.dumps(content)}}}'
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+LabelKey = Tuple[str, ...]
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[LabelKey, list]]] = []
+        self._retired: Dict[LabelKey, list] = {}
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _shard(self) -> Dict[LabelKey, list]:
+        # Each thread writes to its own dict, so the hot path never takes a lock.
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                # Fold finished threads here too, so per-request threads cannot pile up
+                # shards between scrapes.
+                self._fold_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_dead_shards(self) -> None:
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge_into(self._retired, shard)
+        self._shards = alive
+
+    def _merge_into(self, target: Dict[LabelKey, list], source: Dict[LabelKey, list]) -> None:
+        for key, cell in list(source.items()):
+            current = target.get(key)
+            if current is None:
+                target[key] = list(cell)
+            else:
+                for index, value in enumerate(cell):
+                    current[index] += value
+
+    def collect(self) -> Dict[LabelKey, list]:
+        with self._lock:
+            self._fold_dead_shards()
+            merged: Dict[LabelKey, list] = {}
+            self._merge_into(merged, self._retired)
+            for _, shard in self._shards:
+                self._merge_into(merged, shard)
+        return merged
+
+    def _labels(self, key: LabelKey, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def render(self) -> List[str]: ...
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            shard[key] = [amount]
+        else:
+            cell[0] += amount
+
+    def value(self, **labels: object) -> float:
+        cell = self.collect().get(self._key(labels))
+        return cell[0] if cell else 0
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{self._labels(key)} {_format(cell[0])}"
+            for key, cell in sorted(self.collect().items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: object) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            # One slot per bucket, one for +Inf, then the running sum and count.
+            cell = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            shard[key] = cell
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        cell = self.collect().get(self._key(labels))
+        return cell[-1] if cell else 0
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        for key, cell in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), cell):
+                cumulative += hits
+                bucket = 'le="' + _format(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._labels(key, bucket)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format(cell[-2])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cell[-1]}")
+        return lines
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._function: Callable[[], float] | None = None
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def render(self) -> List[str]:
+        if self._function is None:
+            return []
+        try:
+            value = self._function()
+        except Exception:
+            return []
+        return [f"{self.name} {_format(value)}"]
+
+
+Metric = Union[Counter, Histogram, Gauge]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get_or_create(self, name: str, factory: Callable[[], Metric]) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._get_or_create(name, lambda: Counter(name, help_text, labelnames))
+        assert isinstance(metric, Counter)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._get_or_create(
+            name,
+            lambda: Histogram(name, help_text, labelnames, buckets),
+        )
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        metric = self._get_or_create(name, lambda: Gauge(name, help_text))
+        assert isinstance(metric, Gauge)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "openclaw_http_request_seconds",
+    "HTTP request latency by route.",
+    ("route", "method", "status"),
+)
+INTENT_MATCH_SECONDS = REGISTRY.histogram(
+    "openclaw_intent_match_seconds",
+    "Time spent matching direct tool intents.",
+    ("matched",),
+)
+OLLAMA_SECONDS = REGISTRY.histogram(
+    "openclaw_ollama_seconds",
+    "Ollama call latency by endpoint, model and stage.",
+    ("endpoint", "model", "stage"),
+)
+OLLAMA_ERRORS = REGISTRY.counter(
+    "openclaw_ollama_errors_total",
+    "Failed Ollama calls by endpoint and model.",
+    ("endpoint", "model"),
+)
+STORAGE_WRITE_ERRORS = REGISTRY.counter(
+    "openclaw_storage_write_errors_total",
+    "SQLite write failures; 'dropped' counts statements that were not written.",
+    ("outcome",),
+)
+TOOL_SECONDS = REGISTRY.histogram(
+    "openclaw_tool_seconds",
+    "ToolExecutor latency by tool and outcome.",
+    ("tool", "ok"),
+)
+VISION_STAGE_SECONDS = REGISTRY.histogram(
+    "openclaw_vision_stage_seconds",
+    "Per-frame vision pipeline stage latency.",
+    ("stage",),
+)
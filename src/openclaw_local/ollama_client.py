@@ -1,39 +1,160 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Mapping
 
 import requests
 
 from openclaw_local.config import ModelConfig
+from openclaw_local.metrics import OLLAMA_ERRORS, OLLAMA_SECONDS
+from openclaw_local.router import OllamaRouter, router_for
+from openclaw_local.tracing import TRACER
+
+
+def encode_messages(messages: Iterable[Mapping[str, Any]]) -> str:
+    json_chunks = getattr(messages, "json_chunks", None)
+    if json_chunks is not None:
+        chunks = json_chunks()
+    else:
+        chunks = (json.dumps(message) for message in messages)
+    return "[" + ", ".join(chunks) + "]"
 
 
 class OllamaClient:
-    def __init__(self, config: ModelConfig) -> None:
+    def __init__(self, config: ModelConfig, affinity: str | None = None) -> None:
         self._config = config
+        self._affinity = affinity or uuid.uuid4().hex
+        self._router: OllamaRouter | None = (
+            router_for(config.backends) if config.base_urls else None
+        )
+
+    def chat(
+        self,
+        messages: Iterable[Mapping[str, Any]],
+        options: Mapping[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        with TRACER.span("ollama.chat", model=self._config.model):
+            return self._chat(messages, options)
+
+    def _chat(
+        self,
+        messages: Iterable[Mapping[str, Any]],
+        options: Mapping[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": self._config.model, "stream": False}
+        if options:
+            payload["options"] = dict(options)
+        body = json.dumps(payload)[:-1] + ', "messages": ' + encode_messages(messages) + "}"
+        if self._router is None:
+            return self._post_chat(self._config.base_url, body)
+        tried: List[str] = []
+        while True:
+            base_url = self._router.acquire(self._config.model, self._affinity, exclude=tried)
+            try:
+                data = self._post_chat(base_url, body)
+            except (requests.ConnectionError, requests.Timeout):
+                # The node is down or stuck: take it out of rotation and try the next one.
+                self._router.release(base_url, failed=True)
+                tried.append(base_url)
+                if len(tried) >= len(self._router.urls):
+                    raise
+                continue
+            except requests.RequestException:
+                self._router.release(base_url)
+                raise
+            self._router.release(base_url)
+            return data
 
-    def chat(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
-        payload = {
-            "model": self._config.model,
-            "messages": messages,
-            "stream": False,
-        }
-        response = requests.post(
-            f"{self._config.base_url}/api/chat",
-            data=json.dumps(payload),
-            headers={"Content-Type": "application/json"},
-            timeout=min(self._config.request_timeout_s, 3),
+    def _post_chat(self, base_url: str, body: str) -> Dict[str, Any]:
+        model = self._config.model
+        started = time.perf_counter()
+        response = None
+        try:
+            response = requests.post(
+                f"{base_url}/api/chat",
+                data=body.encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                timeout=min(self._config.request_timeout_s, 3),
+                stream=True,
+            )
+            OLLAMA_SECONDS.observe(
+                time.perf_counter() - started,
+                endpoint="chat",
+                model=model,
+                stage="first_byte",
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException:
+            OLLAMA_ERRORS.inc(endpoint="chat", model=model)
+            raise
+        finally:
+            # A streamed response holds its connection until it is read or closed.
+            if response is not None:
+                response.close()
+        OLLAMA_SECONDS.observe(
+            time.perf_counter() - started,
+            endpoint="chat",
+            model=model,
+            stage="total",
+        )
+        return data
+
+    def load_model(self) -> None:
+        # An empty chat makes Ollama load the model into memory without generating anything.
+        base_url = self._config.base_url
+        if self._router is not None:
+            base_url = self._router.acquire(self._config.model, self._affinity)
+        started = time.perf_counter()
+        failed = False
+        try:
+            response = requests.post(
+                f"{base_url}/api/chat",
+                json={"model": self._config.model, "messages": [], "stream": False},
+                timeout=self._config.request_timeout_s,
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            failed = True
+            OLLAMA_ERRORS.inc(endpoint="load", model=self._config.model)
+            raise
+        finally:
+            if self._router is not None:
+                self._router.release(base_url, failed=failed)
+        OLLAMA_SECONDS.observe(
+            time.perf_counter() - started,
+            endpoint="load",
+            model=self._config.model,
+            stage="total",
         )
-        response.raise_for_status()
-        return response.json()
 
     def list_models(self) -> List[str]:
-        response = requests.get(
-            f"{self._config.base_url}/api/tags",
-            timeout=min(self._config.request_timeout_s, 3),
+        if self._router is not None:
+            # The scheduler keeps the router's health checks current; probing every node here
+            # would put a dead node's timeout on the status request.
+            models = self._router.models()
+            if not any(backend["healthy"] for backend in self._router.stats()):
+                raise requests.ConnectionError("No healthy Ollama backend")
+            return models
+        started = time.perf_counter()
+        try:
+            response = requests.get(
+                f"{self._config.base_url}/api/tags",
+                timeout=min(self._config.request_timeout_s, 3),
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException:
+            OLLAMA_ERRORS.inc(endpoint="tags", model="")
+            raise
+        OLLAMA_SECONDS.observe(
+            time.perf_counter() - started,
+            endpoint="tags",
+            model="",
+            stage="total",
         )
-        response.raise_for_status()
-        data = response.json()
         return [item["name"] for item in data.get("models", []) if "name" in item]
 
     def status(self) -> Dict[str, Any]:
@@ -41,4 +162,7 @@ class OllamaClient:
             models = self.list_models()
         except requests.RequestException as exc:
             return {"ok": False, "models": [], "error": str(exc)}
-        return {"ok": True, "models": models, "error": None}
+        status: Dict[str, Any] = {"ok": True, "models": models, "error": None}
+        if self._router is not None:
+            status["backends"] = self._router.stats()
+        return status
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from openclaw_local.plugins import (
+    Handler,
+    PluginCrashed,
+    PluginTimeout,
+    call_handler,
+    load_target,
+)
+
+HandlerRef = Union[str, Handler]
+
+
+def _worker_main(conn: Connection, preload: Sequence[str]) -> None:
+    handlers: Dict[str, Handler] = {}
+    for target in preload:
+        try:
+            handlers[target] = load_target(target)
+        except Exception:
+            # Reported on the first call instead, where the caller can see it.
+            continue
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        ref, payload = message
+        try:
+            if isinstance(ref, str):
+                handler = handlers.get(ref)
+                if handler is None:
+                    handler = handlers[ref] = load_target(ref)
+            else:
+                handler = ref
+            conn.send((True, call_handler(handler, payload)))
+        except Exception as exc:
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+    calls: int = 0
+
+
+class PluginWorkerPool:
+    def __init__(
+        self,
+        size: int | None = None,
+        timeout_s: float = 30.0,
+        preload: Sequence[str] = (),
+    ) -> None:
+        # spawn, not fork: the server process has live threads and open sockets.
+        self._context = multiprocessing.get_context("spawn")
+        self._size = max(1, size or min(4, os.cpu_count() or 1))
+        self.timeout_s = timeout_s
+        self._preload = list(preload)
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._closed = False
+        self.respawns = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        with self._lock:
+            while len(self._workers) < self._size:
+                self._add_worker()
+
+    def _add_worker(self) -> None:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child, self._preload),
+            name="openclaw-plugin-worker",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        worker = _Worker(process, parent)
+        self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def _respawn(self, worker: _Worker) -> None:
+        self._discard(worker)
+        with self._lock:
+            self.respawns += 1
+            if not self._closed and len(self._workers) < self._size:
+                self._add_worker()
+
+    def resize(self, size: int) -> None:
+        with self._lock:
+            self._size = max(1, size)
+            while len(self._workers) < self._size:
+                self._add_worker()
+        # Shrinking retires idle workers; busy ones finish their call first.
+        while True:
+            with self._lock:
+                if len(self._workers) <= self._size:
+                    return
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._stop_worker(worker)
+
+    def _stop_worker(self, worker: _Worker) -> None:
+        try:
+            worker.conn.send(None)
+            worker.process.join(timeout=1)
+        except OSError:
+            pass
+        self._discard(worker)
+
+    def call(self, ref: HandlerRef, payload: str, timeout_s: float | None = None) -> str:
+        if self._closed:
+            raise RuntimeError("Plugin worker pool is closed")
+        timeout = self.timeout_s if timeout_s is None else timeout_s
+        started = time.monotonic()
+        if len(self._workers) < self._size:
+            self.start()
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PluginTimeout(f"No plugin worker free within {timeout}s") from None
+
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        answered = healthy = respawned = False
+        try:
+            try:
+                worker.conn.send((ref, payload))
+            except (EOFError, OSError):
+                raise
+            except Exception:
+                # Pickling failed before anything reached the pipe; the worker is untouched.
+                healthy = True
+                raise
+            answered = worker.conn.poll(remaining)
+            if answered:
+                ok, value = worker.conn.recv()
+                healthy = True
+        except (EOFError, OSError):
+            self._respawn(worker)
+            respawned = True
+            raise PluginCrashed(
+                f"Plugin worker exited with code {worker.process.exitcode}"
+            ) from None
+        finally:
+            # Every path hands the worker back: reused if the pipe is clean, else replaced.
+            if healthy:
+                worker.calls += 1
+                self._idle.put(worker)
+            elif not respawned:
+                self._respawn(worker)
+        if not answered:
+            raise PluginTimeout(f"Plugin call exceeded {timeout}s")
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self._size,
+                "workers": len(self._workers),
+                "idle": self._idle.qsize(),
+                "respawns": self.respawns,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers: Tuple[_Worker, ...] = tuple(self._workers)
+        for worker in workers:
+            self._stop_worker(worker)
@@ -1,29 +1,345 @@
 from __future__ import annotations
 
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable
+from importlib import metadata
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Union,
+)
+
+from openclaw_local.config import DEFAULT_DB_PATH
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from openclaw_local.plugin_workers import PluginWorkerPool
+
+ENTRY_POINT_GROUP = "openclaw_local.plugins"
+DEFAULT_MANIFEST_PATH = DEFAULT_DB_PATH.parent / "plugins.json"
+
+Handler = Union[
+    Callable[[str], str],
+    Callable[[str], Iterator[str]],
+    Callable[[str], Awaitable[str]],
+    Callable[[str], AsyncIterator[str]],
+]
+
+
+class PluginTimeout(TimeoutError):
+    pass
+
+
+class PluginCrashed(RuntimeError):
+    pass
 
 
 @dataclass(frozen=True)
 class Plugin:
     name: str
     description: str
-    handler: Callable[[str], str]
+    handler: Handler | None = None
+    # "package.module:attribute", imported the first time the plugin runs.
+    target: str | None = None
+    # CPU-heavy or untrusted plugins run in a worker process instead of inline.
+    isolated: bool = False
+    timeout_s: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.handler is None and self.target is None:
+            raise ValueError(f"Plugin {self.name} needs a handler or a target")
+
+
+def load_target(target: str) -> Any:
+    module_name, _, attribute = target.partition(":")
+    value: Any = importlib.import_module(module_name)
+    for part in filter(None, attribute.split(".")):
+        value = getattr(value, part)
+    return value
+
+
+async def _join_chunks(chunks: AsyncIterator[str]) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+def call_handler(handler: Handler, payload: str) -> str:
+    # Used where no shared loop is available, e.g. inside plugin worker processes.
+    result = handler(payload)
+    if inspect.isasyncgen(result) or inspect.isawaitable(result):
+        import asyncio
+
+        return asyncio.run(_join_chunks(result) if inspect.isasyncgen(result) else result)
+    if inspect.isgenerator(result):
+        return "".join(result)
+    return result
+
+
+class AsyncPluginLoop:
+    def __init__(self, max_concurrency: int = 32) -> None:
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    def _ensure(self) -> asyncio.AbstractEventLoop:
+        import asyncio
+
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._slots = asyncio.Semaphore(self.max_concurrency)
+                self._thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="plugin-loop",
+                    daemon=True,
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coroutine: Awaitable[Any], timeout_s: float | None) -> Any:
+        import asyncio
+
+        loop = self._ensure()
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coroutine, timeout_s), loop)
+        try:
+            return future.result()
+        except asyncio.TimeoutError:
+            raise PluginTimeout(f"Plugin call exceeded {timeout_s}s") from None
+
+    async def _guarded(self, coroutine: Awaitable[str]) -> str:
+        assert self._slots is not None
+        async with self._slots:
+            return await coroutine
+
+    def call(self, coroutine: Awaitable[str], timeout_s: float | None = None) -> str:
+        self._ensure()
+        return self._submit(self._guarded(coroutine), timeout_s)
+
+    def iterate(self, chunks: AsyncIterator[str], timeout_s: float | None = None) -> Iterator[str]:
+        # Pulls one chunk per round trip, so a slow consumer also paces the handler.
+        import asyncio
+
+        loop = self._ensure()
+        assert self._slots is not None
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+
+        async def step() -> tuple[bool, str]:
+            try:
+                return True, await chunks.__anext__()
+            except StopAsyncIteration:
+                return False, ""
+
+        self._submit(self._slots.acquire(), timeout_s)
+        try:
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                more, chunk = self._submit(step(), remaining)
+                if not more:
+                    return
+                yield chunk
+        finally:
+            asyncio.run_coroutine_threadsafe(chunks.aclose(), loop)
+            loop.call_soon_threadsafe(self._slots.release)
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+
+def _path_fingerprint() -> str:
+    # Entry points live in distribution metadata, so only the .dist-info (and legacy .egg-info)
+    # directories on sys.path decide whether the cached manifest is stale. Other files, such as
+    # sources edited in the working directory, leave the fingerprint alone.
+    import hashlib
+
+    digest = hashlib.sha256(sys.version.encode())
+    for entry in sys.path:
+        try:
+            with os.scandir(entry or ".") as scan:
+                stamps = sorted(
+                    (item.name, item.stat().st_mtime_ns)
+                    for item in scan
+                    if item.name.endswith((".dist-info", ".egg-info"))
+                )
+        except OSError:
+            continue
+        for name, stamp in stamps:
+            digest.update(f"{entry}\0{name}\0{stamp}\0".encode())
+    return digest.hexdigest()
+
+
+def _scan_entry_points(group: str) -> List[Dict[str, str]]:
+    found = []
+    for entry_point in metadata.entry_points(group=group):
+        dist = entry_point.dist
+        summary = dist.metadata.get("Summary", "") if dist is not None else ""
+        found.append(
+            {"name": entry_point.name, "description": summary or "", "target": entry_point.value}
+        )
+    return sorted(found, key=lambda item: item["name"])
+
+
+def load_manifest(
+    path: Path | None = DEFAULT_MANIFEST_PATH,
+    group: str = ENTRY_POINT_GROUP,
+) -> List[Dict[str, str]]:
+    fingerprint = f"{group}:{_path_fingerprint()}"
+    if path is not None:
+        try:
+            cached = json.loads(path.read_text(encoding="utf-8"))
+            if cached.get("fingerprint") == fingerprint:
+                return cached["plugins"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    plugins = _scan_entry_points(group)
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"fingerprint": fingerprint, "plugins": plugins}), "utf-8")
+            tmp.replace(path)
+        except OSError:
+            pass
+    return plugins
 
 
 class PluginRegistry:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        workers: PluginWorkerPool | None = None,
+        isolate_discovered: bool = False,
+        max_async: int = 32,
+    ) -> None:
         self._plugins: Dict[str, Plugin] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self._workers = workers
+        self._isolate_discovered = isolate_discovered
+        self._async = AsyncPluginLoop(max_async)
 
     def register(self, plugin: Plugin) -> None:
-        if plugin.name in self._plugins:
-            raise ValueError(f"Plugin already registered: {plugin.name}")
-        self._plugins[plugin.name] = plugin
+        if plugin.isolated and plugin.handler is not None:
+            import pickle
+
+            try:
+                pickle.dumps(plugin.handler)
+            except Exception as exc:
+                # Isolated handlers are sent to worker processes, so they must pickle.
+                raise ValueError(
+                    f"Isolated plugin {plugin.name} needs a module-level handler: {exc}"
+                ) from None
+        with self._lock:
+            if plugin.name in self._plugins:
+                raise ValueError(f"Plugin already registered: {plugin.name}")
+            self._plugins[plugin.name] = plugin
+            if plugin.handler is not None:
+                self._handlers[plugin.name] = plugin.handler
+
+    def discover(
+        self,
+        manifest_path: Path | None = DEFAULT_MANIFEST_PATH,
+        group: str = ENTRY_POINT_GROUP,
+    ) -> int:
+        added = 0
+        for entry in load_manifest(manifest_path, group):
+            with self._lock:
+                if entry["name"] in self._plugins:
+                    continue
+                self._plugins[entry["name"]] = Plugin(
+                    name=entry["name"],
+                    description=entry["description"],
+                    target=entry["target"],
+                    isolated=self._isolate_discovered,
+                )
+            added += 1
+        return added
 
     def list(self) -> Iterable[Plugin]:
-        return self._plugins.values()
+        with self._lock:
+            return list(self._plugins.values())
 
-    def run(self, name: str, payload: str) -> str:
-        if name not in self._plugins:
+    def get(self, name: str) -> Plugin:
+        with self._lock:
+            plugin = self._plugins.get(name)
+        if plugin is None:
             raise KeyError(f"Unknown plugin: {name}")
-        return self._plugins[name].handler(payload)
+        return plugin
+
+    def handler(self, name: str) -> Handler:
+        handler = self._handlers.get(name)
+        if handler is not None:
+            return handler
+        plugin = self.get(name)
+        assert plugin.target is not None
+        loaded = load_target(plugin.target)
+        with self._lock:
+            return self._handlers.setdefault(name, loaded)
+
+    def workers(self) -> PluginWorkerPool:
+        from openclaw_local.plugin_workers import PluginWorkerPool
+
+        with self._lock:
+            if self._workers is None:
+                preload = [p.target for p in self._plugins.values() if p.isolated and p.target]
+                self._workers = PluginWorkerPool(preload=preload)
+            return self._workers
+
+    def run(self, name: str, payload: str) -> str:
+        plugin = self.get(name)
+        if plugin.isolated:
+            ref = plugin.target if plugin.target is not None else plugin.handler
+            assert ref is not None
+            return self.workers().call(ref, payload, plugin.timeout_s)
+        result = self.handler(name)(payload)
+        if inspect.isasyncgen(result):
+            return self._async.call(_join_chunks(result), plugin.timeout_s)
+        if inspect.isawaitable(result):
+            return self._async.call(result, plugin.timeout_s)
+        if inspect.isgenerator(result):
+            return "".join(result)
+        return result
+
+    def stream(self, name: str, payload: str) -> Iterator[str]:
+        plugin = self.get(name)
+        if plugin.isolated:
+            yield self.run(name, payload)
+            return
+        result = self.handler(name)(payload)
+        if inspect.isasyncgen(result):
+            yield from self._async.iterate(result, plugin.timeout_s)
+        elif inspect.isawaitable(result):
+            yield self._async.call(result, plugin.timeout_s)
+        elif inspect.isgenerator(result):
+            yield from result
+        else:
+            yield result
+
+    def close(self) -> None:
+        self._async.close()
+        with self._lock:
+            workers, self._workers = self._workers, None
+        if workers is not None:
+            workers.close()
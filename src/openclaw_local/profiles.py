@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Tuple
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    name: str
+    num_ctx: int
+    num_predict: int
+    temperature: float
+    stop: Tuple[str, ...] = ()
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "num_ctx": self.num_ctx,
+            "num_predict": self.num_predict,
+            "temperature": self.temperature,
+        }
+        if self.stop:
+            options["stop"] = list(self.stop)
+        return options
+
+    def tightened(self) -> "GenerationProfile":
+        # Tool follow-ups only need to relay a result, so cap the output and the randomness.
+        return replace(
+            self,
+            name=f"{self.name}-follow-up",
+            num_predict=min(self.num_predict, 256),
+            temperature=min(self.temperature, 0.3),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, **self.options()}
+
+
+PROFILES: Dict[str, GenerationProfile] = {
+    profile.name: profile
+    for profile in (
+        GenerationProfile(
+            "fast", num_ctx=2048, num_predict=256, temperature=0.3, stop=("\nUser:",)
+        ),
+        GenerationProfile("balanced", num_ctx=4096, num_predict=1024, temperature=0.7),
+        GenerationProfile("thorough", num_ctx=8192, num_predict=4096, temperature=0.8),
+    )
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(name: str) -> GenerationProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown generation profile: {name}") from None
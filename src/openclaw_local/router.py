@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Sequence, Tuple
+
+import requests
+
+from openclaw_local.metrics import REGISTRY
+
+ROUTED_REQUESTS = REGISTRY.counter(
+    "openclaw_ollama_routed_total",
+    "Chat requests routed to each Ollama backend, by routing decision.",
+    ("backend", "reason"),
+)
+
+
+@dataclass
+class Backend:
+    url: str
+    models: set[str] = field(default_factory=set)
+    healthy: bool = True
+    in_flight: int = 0
+    failures: int = 0
+    checked_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "models": sorted(self.models),
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "checked_at": self.checked_at,
+        }
+
+
+class OllamaRouter:
+    def __init__(
+        self,
+        urls: Sequence[str],
+        check_timeout_s: float = 2.0,
+        retry_after_s: float = 30.0,
+        max_affinity: int = 4096,
+    ) -> None:
+        if not urls:
+            raise ValueError("OllamaRouter needs at least one backend URL")
+        self._lock = threading.Lock()
+        self._backends = {url.rstrip("/"): Backend(url.rstrip("/")) for url in urls}
+        self._affinity: "OrderedDict[str, str]" = OrderedDict()
+        self._max_affinity = max_affinity
+        self._check_timeout_s = check_timeout_s
+        self._retry_after_s = retry_after_s
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._backends)
+
+    def refresh(self) -> None:
+        # Health checks run outside the lock so a slow node never blocks routing.
+        for url in self.urls:
+            try:
+                response = requests.get(f"{url}/api/tags", timeout=self._check_timeout_s)
+                response.raise_for_status()
+                items = response.json().get("models", [])
+                models = {item["name"] for item in items if "name" in item}
+            except (requests.RequestException, ValueError):
+                self._update(url, healthy=False)
+            else:
+                self._update(url, healthy=True, models=models)
+
+    def _update(self, url: str, healthy: bool, models: set[str] | None = None) -> None:
+        with self._lock:
+            backend = self._backends[url]
+            backend.healthy = healthy
+            backend.checked_at = time.time()
+            if models is not None:
+                backend.models = models
+            if not healthy:
+                backend.failures += 1
+
+    def _available(self, backend: Backend, now: float) -> bool:
+        # A failed node gets another chance after retry_after_s even without a health check.
+        return backend.healthy or now - backend.checked_at >= self._retry_after_s
+
+    def acquire(self, model: str, affinity: str, exclude: Collection[str] = ()) -> str:
+        now = time.time()
+        with self._lock:
+            candidates = [
+                backend
+                for backend in self._backends.values()
+                if backend.url not in exclude and self._available(backend, now)
+            ]
+            if not candidates:
+                raise requests.ConnectionError(f"No healthy Ollama backend for model {model}")
+
+            sticky = self._backends.get(self._affinity.get(affinity, ""))
+            if sticky in candidates and (model in sticky.models or not sticky.models):
+                chosen, reason = sticky, "sticky"
+            else:
+                # Prefer nodes that already have the model so we don't trigger a cold load.
+                warm = [backend for backend in candidates if model in backend.models]
+                pool = warm or candidates
+                chosen = min(pool, key=lambda backend: backend.in_flight)
+                reason = "warm" if warm else "cold"
+            chosen.in_flight += 1
+            self._affinity[affinity] = chosen.url
+            self._affinity.move_to_end(affinity)
+            while len(self._affinity) > self._max_affinity:
+                self._affinity.popitem(last=False)
+        ROUTED_REQUESTS.inc(backend=chosen.url, reason=reason)
+        return chosen.url
+
+    def release(self, url: str, failed: bool = False) -> None:
+        with self._lock:
+            backend = self._backends[url]
+            backend.in_flight = max(0, backend.in_flight - 1)
+            if failed:
+                backend.healthy = False
+                backend.failures += 1
+                backend.checked_at = time.time()
+            else:
+                backend.healthy = True
+
+    def models(self) -> List[str]:
+        with self._lock:
+            names = set()
+            for backend in self._backends.values():
+                if backend.healthy:
+                    names |= backend.models
+        return sorted(names)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [backend.to_dict() for backend in self._backends.values()]
+
+
+_ROUTERS: Dict[Tuple[str, ...], OllamaRouter] = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+def router_for(urls: Sequence[str]) -> OllamaRouter:
+    # One router per backend pool, shared by every client so load counts are global.
+    key = tuple(url.rstrip("/") for url in urls)
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is None:
+            router = _ROUTERS[key] = OllamaRouter(key)
+        return router
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, List, Protocol, Tuple
+
+from openclaw_local.tasks import Task, TaskResult, TaskRunner
+
+
+class Schedule(Protocol):
+    # True if next_after works in wall-clock time, False for the monotonic clock.
+    wall_clock: bool
+
+    def next_after(self, moment: float) -> float: ...
+
+
+@dataclass(frozen=True)
+class Interval:
+    seconds: float
+    wall_clock: ClassVar[bool] = False
+
+    def __post_init__(self) -> None:
+        if self.seconds <= 0:
+            raise ValueError("Interval must be positive")
+
+    def next_after(self, moment: float) -> float:
+        return moment + self.seconds
+
+
+_CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+def _parse_cron_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values: set[int] = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, stop = low, high
+        elif "-" in spec:
+            first, last = spec.split("-", 1)
+            start, stop = int(first), int(last)
+        else:
+            start = int(spec)
+            stop = high if step_text else start
+        if step < 1 or start < low or stop > high or start > stop:
+            raise ValueError(f"Invalid cron field: {text}")
+        values.update(range(start, stop + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class Cron:
+    expression: str
+    wall_clock: ClassVar[bool] = True
+    fields: Tuple[FrozenSet[int], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        parts = self.expression.split()
+        if len(parts) != len(_CRON_FIELDS):
+            raise ValueError(f"Cron expression needs 5 fields: {self.expression}")
+        parsed = []
+        for text, (_, low, high) in zip(parts, _CRON_FIELDS):
+            values = _parse_cron_field(text, low, high + (1 if high == 6 else 0))
+            parsed.append(frozenset(v % 7 for v in values) if high == 6 else values)
+        object.__setattr__(self, "fields", tuple(parsed))
+
+    def _day_matches(self, moment: datetime) -> bool:
+        _, _, days, _, weekdays = self.fields
+        day_ok = moment.day in days
+        weekday_ok = (moment.weekday() + 1) % 7 in weekdays
+        # Standard cron: when both day fields are restricted, either may match.
+        if len(days) < 31 and len(weekdays) < 7:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: float) -> float:
+        minutes, hours, _, months, _ = self.fields
+        current = datetime.fromtimestamp(moment).replace(second=0, microsecond=0)
+        current += timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 5)
+        # Skip whole months, days and hours at a time instead of scanning minute by minute.
+        while current < limit:
+            if current.month not in months:
+                current = current.replace(
+                    year=current.year + (current.month == 12),
+                    month=current.month % 12 + 1,
+                    day=1,
+                    hour=0,
+                    minute=0,
+                )
+            elif not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+            elif current.hour not in hours:
+                current = (current + timedelta(hours=1)).replace(minute=0)
+            elif current.minute not in minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current.timestamp()
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+
+@dataclass
+class ScheduledTask:
+    task: Task
+    schedule: Schedule
+    jitter_s: float = 0.0
+    max_concurrent: int = 1
+    next_run: float = 0.0
+    base_run: float = 0.0
+    running: int = 0
+    runs: int = 0
+    missed: int = 0
+    skipped: int = 0
+    last_result: TaskResult | None = None
+    removed: bool = False
+    runners: List[TaskRunner] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        last = self.last_result
+        return {
+            "name": self.task.name,
+            "next_run": time.time() + (self.next_run - time.monotonic()),
+            "running": self.running,
+            "runs": self.runs,
+            "missed": self.missed,
+            "skipped": self.skipped,
+            "last_status": last.status if last else None,
+            "last_error": last.error if last else None,
+            "last_duration_ms": last.duration_ms if last else None,
+        }
+
+
+class Scheduler:
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduled")
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._entries: Dict[str, ScheduledTask] = {}
+        self._counter = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def add(
+        self,
+        task: Task,
+        schedule: Schedule,
+        jitter_s: float = 0.0,
+        max_concurrent: int = 1,
+        run_now: bool = False,
+    ) -> ScheduledTask:
+        now = _clock(schedule)
+        entry = ScheduledTask(task, schedule, jitter_s, max(1, max_concurrent))
+        entry.base_run = now if run_now else entry.schedule.next_after(now)
+        due = entry.base_run if run_now else self._jitter(entry, entry.base_run)
+        entry.next_run = _monotonic_due(due, now)
+        with self._condition:
+            if task.name in self._entries:
+                raise ValueError(f"Task already scheduled: {task.name}")
+            self._entries[task.name] = entry
+            self._push(entry)
+            self._condition.notify()
+        return entry
+
+    def remove(self, name: str) -> bool:
+        with self._condition:
+            entry = self._entries.pop(name, None)
+            if entry is None:
+                return False
+            # Lazy deletion: the stale heap item is dropped when it reaches the top.
+            entry.removed = True
+            return True
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None or self._stopped:
+                return
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._condition:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+    def progress(self) -> List[Dict[str, Any]]:
+        with self._condition:
+            runs = [
+                (entry.task.name, runner)
+                for entry in self._entries.values()
+                for runner in entry.runners
+            ]
+        return [{"name": name, **runner.progress()} for name, runner in runs]
+
+    def _jitter(self, entry: ScheduledTask, due: float) -> float:
+        return due + random.uniform(0, entry.jitter_s) if entry.jitter_s > 0 else due
+
+    def _push(self, entry: ScheduledTask) -> None:
+        heapq.heappush(self._heap, (entry.next_run, next(self._counter), entry))
+
+    def _loop(self) -> None:
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, entry = self._heap[0]
+                if entry.removed:
+                    heapq.heappop(self._heap)
+                    continue
+                now = time.monotonic()
+                if due > now:
+                    # Sleeps until the earliest deadline, so idle entries cost nothing.
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                self._fire(entry)
+
+    def _fire(self, entry: ScheduledTask) -> None:
+        if entry.running >= entry.max_concurrent:
+            entry.skipped += 1
+        else:
+            entry.running += 1
+            entry.runs += 1
+            self._executor.submit(self._run, entry)
+
+        # Coalesce: any runs that fell due while we were late collapse into this one.
+        # Jitter is applied on top of the schedule so it never accumulates as drift.
+        now = _clock(entry.schedule)
+        base = entry.schedule.next_after(entry.base_run)
+        while base <= now:
+            entry.missed += 1
+            base = entry.schedule.next_after(base)
+        entry.base_run = base
+        entry.next_run = _monotonic_due(self._jitter(entry, base), now)
+        self._push(entry)
+
+    def _run(self, entry: ScheduledTask) -> None:
+        # The task runs right here on the scheduled worker rather than on a second pool.
+        runner = TaskRunner([entry.task], max_workers=1, executor=_INLINE)
+        with self._condition:
+            entry.runners.append(runner)
+        try:
+            [entry.last_result] = runner.run_all()
+        finally:
+            with self._condition:
+                entry.running -= 1
+                entry.runners.remove(runner)
+
+
+def _clock(schedule: Schedule) -> float:
+    # Interval deadlines follow the monotonic clock so a wall-clock jump cannot fire or
+    # stall them; cron expressions are about wall time by definition.
+    return time.time() if schedule.wall_clock else time.monotonic()
+
+
+def _monotonic_due(due: float, clock_now: float) -> float:
+    # The heap is ordered on the monotonic clock whatever clock the schedule uses.
+    return time.monotonic() + (due - clock_now)
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+_INLINE = _InlineExecutor()
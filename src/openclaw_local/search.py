@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+DocKey = Tuple[str, int]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def fts_query(text: str) -> str | None:
+    # Quote every term so user input can never be parsed as FTS5 syntax; the last
+    # term is a prefix match so results show up while the user is still typing.
+    terms = tokenize(text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    chat_id: str
+    seq: int
+    role: str
+    snippet: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chat_id": self.chat_id,
+            "seq": self.seq,
+            "role": self.role,
+            "snippet": self.snippet,
+            "score": round(self.score, 4),
+        }
+
+
+# Used when chats are kept in memory only; persisted chats are searched through FTS5.
+class SearchIndex:
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[DocKey, int]] = defaultdict(dict)
+        self._docs: Dict[DocKey, Tuple[str, str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, chat_id: str, seq: int, role: str, content: str) -> None:
+        terms = tokenize(content)
+        key = (chat_id, seq)
+        with self._lock:
+            if key in self._docs:
+                return
+            self._docs[key] = (role, content, len(terms))
+            self._total_length += len(terms)
+            for term in terms:
+                postings = self._postings[term]
+                postings[key] = postings.get(key, 0) + 1
+
+    def _matching(self, term: str, prefix: bool) -> Dict[DocKey, int]:
+        if not prefix:
+            return self._postings.get(term, {})
+        merged: Dict[DocKey, int] = {}
+        for candidate, postings in self._postings.items():
+            if candidate.startswith(term):
+                for key, count in postings.items():
+                    merged[key] = merged.get(key, 0) + count
+        return merged
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        markers: Tuple[str, str] = ("[", "]"),
+    ) -> List[SearchHit]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            total_docs = len(self._docs)
+            if not total_docs:
+                return []
+            average = self._total_length / total_docs
+            per_term = [
+                self._matching(term, prefix=index == len(terms) - 1)
+                for index, term in enumerate(terms)
+            ]
+            candidates = set.intersection(*(set(postings) for postings in per_term))
+            scored = []
+            for key in candidates:
+                length = self._docs[key][2]
+                score = 0.0
+                for postings in per_term:
+                    idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    tf = postings[key]
+                    norm = tf + self.K1 * (1 - self.B + self.B * length / average)
+                    score += idf * tf * (self.K1 + 1) / norm
+                scored.append((score, key))
+            scored.sort(key=lambda item: (-item[0], item[1]))
+            page = [(score, key, self._docs[key]) for score, key in scored[offset : offset + limit]]
+        return [
+            SearchHit(key[0], key[1], role, _snippet(content, terms, markers), score)
+            for score, key, (role, content, _) in page
+        ]
+
+
+def _snippet(content: str, terms: List[str], markers: Tuple[str, str], width: int = 12) -> str:
+    words = content.split()
+    last = len(terms) - 1
+
+    def hit(word: str) -> bool:
+        for token in tokenize(word):
+            for index, term in enumerate(terms):
+                if token == term or (index == last and token.startswith(term)):
+                    return True
+        return False
+
+    first = next((index for index, word in enumerate(words) if hit(word)), 0)
+    start = max(0, first - width // 3)
+    window = words[start : start + width]
+    text = " ".join(f"{markers[0]}{word}{markers[1]}" if hit(word) else word for word in window)
+    if start > 0:
+        text = "…" + text
+    if start + width < len(words):
+        text += "…"
+    return text
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from openclaw_local.config import ServerConfig
+
+if TYPE_CHECKING:
+    from werkzeug.serving import BaseWSGIServer
+
+
+def make_app_server(host: str, port: int, app: Any, config: ServerConfig) -> BaseWSGIServer:
+    # werkzeug is imported here rather than at module level so entry points that only need
+    # the argument helpers (the desktop splash) start without it.
+    if config.mode == "dev":
+        from werkzeug.serving import make_server
+
+        return make_server(host, port, app)
+    from openclaw_local.wsgi_pool import PooledWSGIServer
+
+    return PooledWSGIServer(host, port, app, config)
+
+
+def stop_app_server(server: BaseWSGIServer) -> None:
+    drain = getattr(server, "drain", None)
+    if drain is not None:
+        drain()
+    else:
+        server.shutdown()
+
+
+def wait_until_listening(host: str, port: int, timeout_s: float = 10.0) -> bool:
+    # Wildcard binds are probed over loopback.
+    probe_host = {"": "127.0.0.1", "0.0.0.0": "127.0.0.1", "::": "::1"}.get(host, host)
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            with socket.create_connection((probe_host, port), timeout=0.5):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+
+def serve(host: str, port: int, app: Any, config: ServerConfig) -> None:
+    server = make_app_server(host, port, app, config)
+    thread = threading.Thread(target=server.serve_forever, name="http-accept", daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_app_server(server)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = ServerConfig()
+    parser.add_argument(
+        "--server",
+        choices=["pool", "dev"],
+        default=defaults.mode,
+        help="pool: multi-threaded server with queue limits; dev: single-threaded server",
+    )
+    parser.add_argument("--threads", type=int, default=defaults.threads, help="Worker threads")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=defaults.queue_size,
+        help="Connections allowed to wait for a worker before returning 503",
+    )
+    parser.add_argument(
+        "--keep-alive",
+        type=float,
+        default=defaults.keep_alive_s,
+        help="Seconds an idle HTTP/1.1 connection is kept open for another request",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=defaults.drain_timeout_s,
+        help="Seconds to wait for in-flight requests on shutdown",
+    )
+
+
+def server_config_from_args(args: argparse.Namespace) -> ServerConfig:
+    return ServerConfig(
+        mode=args.server,
+        threads=max(1, args.threads),
+        queue_size=max(0, args.queue_size),
+        keep_alive_s=args.keep_alive,
+        drain_timeout_s=args.drain_timeout,
+    )
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from openclaw_local.messages import DEFAULT_FLAGS, VISIBLE, Record
+from openclaw_local.metrics import STORAGE_WRITE_ERRORS
+from openclaw_local.search import SearchHit, fts_query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    context_start INTEGER NOT NULL DEFAULT 0,
+    profile TEXT NOT NULL DEFAULT 'balanced'
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    flags INTEGER NOT NULL DEFAULT 3
+);
+CREATE UNIQUE INDEX IF NOT EXISTS messages_chat_seq ON messages (chat_id, seq);
+"""
+
+# External-content FTS5 index over visible messages; rows are only ever appended,
+# so the insert trigger keeps it current and the delete trigger is a safety net.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE messages_fts USING fts5(
+    content,
+    content='messages',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages
+WHEN new.flags & 1 BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages
+WHEN old.flags & 1 BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+INSERT INTO messages_fts (rowid, content) SELECT id, content FROM messages WHERE flags & 1;
+"""
+
+MIGRATIONS = (
+    ("chats", "context_start", "INTEGER NOT NULL DEFAULT 0"),
+    ("messages", "flags", "INTEGER NOT NULL DEFAULT 3"),
+    ("chats", "profile", "TEXT NOT NULL DEFAULT 'balanced'"),
+)
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChatRecord:
+    chat_id: str
+    title: str
+    model: str
+    created_at: float
+    message_count: int
+    context_start: int = 0
+    profile: str = "balanced"
+
+
+class ChatStorage:
+    def __init__(self, path: Path | str, batch_size: int = 256) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = batch_size
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        # Unwritten statements per chat, so a reader only waits for its own chat's rows.
+        self._pending: Dict[str | None, int] = {}
+        self._pending_changed = threading.Condition()
+        self._closed = False
+
+        self._read_lock = threading.Lock()
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._migrate()
+        self.full_text = self._create_fts()
+
+        self._writer = threading.Thread(target=self._write_loop, name="chat-storage", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _migrate(self) -> None:
+        with self._read_lock, self._reader:
+            for table, column, ddl in MIGRATIONS:
+                columns = {row[1] for row in self._reader.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self._reader.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+    def _create_fts(self) -> bool:
+        with self._read_lock:
+            exists = self._reader.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+            ).fetchone()
+            if exists:
+                return True
+            try:
+                self._reader.executescript(f"BEGIN; {FTS_SCHEMA} COMMIT;")
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to a substring scan.
+                if self._reader.in_transaction:
+                    self._reader.rollback()
+                return False
+        return True
+
+    def pending_writes(self) -> int:
+        return self._queue.qsize()
+
+    def load_chats(self) -> List[ChatRecord]:
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT id, title, model, created_at, message_count, context_start, profile "
+                "FROM chats ORDER BY created_at"
+            ).fetchall()
+        return [ChatRecord(*row) for row in rows]
+
+    def load_messages(
+        self,
+        chat_id: str,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> List[dict[str, str]]:
+        return [
+            {"role": role, "content": content}
+            for role, content, flags in self.load_records(chat_id, start, stop)
+            if flags & VISIBLE
+        ]
+
+    def load_last_visible(
+        self,
+        chat_id: str,
+        limit: int,
+        stop: int,
+    ) -> Tuple[int, List[dict[str, str]]]:
+        if limit <= 0:
+            return stop, []
+        self.flush(chat_id)
+        sql = (
+            "SELECT seq, role, content FROM messages"
+            " WHERE chat_id = ? AND seq < ? AND flags & ? ORDER BY seq DESC LIMIT ?"
+        )
+        with self._read_lock:
+            rows = self._reader.execute(sql, (chat_id, stop, VISIBLE, limit)).fetchall()
+        # A short page means nothing visible is left before it.
+        start = rows[-1][0] if len(rows) == limit else 0
+        return start, [{"role": role, "content": content} for _, role, content in reversed(rows)]
+
+    def load_records(
+        self,
+        chat_id: str,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> List[Record]:
+        self.flush(chat_id)
+        sql = "SELECT role, content, flags FROM messages WHERE chat_id = ? AND seq >= ?"
+        params: Tuple[Any, ...] = (chat_id, start)
+        if stop is not None:
+            sql += " AND seq < ?"
+            params += (stop,)
+        sql += " ORDER BY seq"
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        markers: Tuple[str, str] = ("[", "]"),
+    ) -> List[SearchHit]:
+        match = fts_query(query)
+        if match is None:
+            return []
+        self.flush()
+        if self.full_text:
+            sql = (
+                "SELECT m.chat_id, m.seq, m.role, "
+                "snippet(messages_fts, 0, ?, ?, '…', 12), -bm25(messages_fts) "
+                "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                "WHERE messages_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?"
+            )
+            params: Tuple[Any, ...] = (markers[0], markers[1], match, limit, offset)
+        else:
+            sql = (
+                "SELECT chat_id, seq, role, substr(content, 1, 160), 0.0 FROM messages "
+                "WHERE flags & 1 AND instr(lower(content), ?) > 0 "
+                "ORDER BY id DESC LIMIT ? OFFSET ?"
+            )
+            params = (query.strip().lower(), limit, offset)
+        with self._read_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def save_chat(
+        self,
+        chat_id: str,
+        title: str,
+        model: str,
+        context_start: int = 0,
+        created_at: float | None = None,
+        profile: str = "balanced",
+    ) -> None:
+        self._put(
+            "INSERT INTO chats (id, title, model, created_at, context_start, profile) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET title = excluded.title, model = excluded.model, "
+            "context_start = excluded.context_start, profile = excluded.profile",
+            (
+                chat_id,
+                title,
+                model,
+                time.time() if created_at is None else created_at,
+                context_start,
+                profile,
+            ),
+            chat_id,
+        )
+
+    def append_message(
+        self,
+        chat_id: str,
+        seq: int,
+        role: str,
+        content: str,
+        flags: int = DEFAULT_FLAGS,
+    ) -> None:
+        self._put(
+            "INSERT INTO messages (chat_id, seq, role, content, flags) VALUES (?, ?, ?, ?, ?)",
+            (chat_id, seq, role, content, flags),
+            chat_id,
+        )
+        self._put(
+            "UPDATE chats SET message_count = MAX(message_count, ?) WHERE id = ?",
+            (seq + 1, chat_id),
+            chat_id,
+        )
+
+    def _put(self, sql: str, params: Sequence[Any], chat_id: str | None = None) -> None:
+        if self._closed:
+            raise RuntimeError("Chat storage is closed")
+        with self._pending_changed:
+            self._pending[chat_id] = self._pending.get(chat_id, 0) + 1
+        self._queue.put((sql, params, chat_id))
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self._batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(item is _STOP for item in batch)
+                statements = [item for item in batch if item is not _STOP]
+                if statements:
+                    self._apply(conn, [(sql, params) for sql, params, _ in statements])
+                    self._settle(chat_id for _, _, chat_id in statements)
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _settle(self, chat_ids: Iterable[str | None]) -> None:
+        with self._pending_changed:
+            for chat_id in chat_ids:
+                left = self._pending[chat_id] - 1
+                if left:
+                    self._pending[chat_id] = left
+                else:
+                    del self._pending[chat_id]
+            self._pending_changed.notify_all()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, statements: List[Tuple[str, Sequence[Any]]]) -> None:
+        try:
+            with conn:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+            return
+        except sqlite3.Error as exc:
+            # One bad row must not sink the whole batch; retry the statements one by one.
+            STORAGE_WRITE_ERRORS.inc(outcome="batch_retried")
+            logger.warning("Chat storage batch of %d failed (%s); retrying", len(statements), exc)
+        for sql, params in statements:
+            try:
+                with conn:
+                    conn.execute(sql, params)
+            except sqlite3.Error:
+                STORAGE_WRITE_ERRORS.inc(outcome="dropped")
+                logger.exception("Chat storage dropped a write: %s %r", sql, params)
+
+    def flush(self, chat_id: str | None = None) -> None:
+        if not self._writer.is_alive():
+            return
+        if chat_id is None:
+            self._queue.join()
+            return
+        with self._pending_changed:
+            while chat_id in self._pending and self._writer.is_alive():
+                self._pending_changed.wait(0.5)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._read_lock:
+            self._reader.close()
+        atexit.unregister(self.close)
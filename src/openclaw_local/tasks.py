@@ -1,30 +1,337 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass, field
-from typing import Callable, List
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Tuple
+
+from openclaw_local.jobs import CANCELLED, DONE, FAILED
+
+TIMED_OUT = "timed_out"
+SKIPPED = "skipped"
+
+BACKENDS = ("thread", "process")
+
+# Upper bound on how long the scheduling loop sleeps, so cancel() is noticed promptly.
+_POLL_S = 0.1
+_END = object()
 
 
 @dataclass
 class Task:
     name: str
     action: Callable[[], str]
+    depends_on: Tuple[str, ...] = ()
+    timeout_s: float | None = None
+    retries: int = 0
 
 
 @dataclass
 class TaskResult:
     name: str
-    output: str
+    output: str | None = None
+    status: str = DONE
+    duration_ms: float = 0.0
+    error: str | None = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.status == DONE
+
+
+@dataclass
+class _Attempt:
+    task: Task
+    number: int
+    started: float | None = None
+    first_started: float | None = None
+    process: Any = None
+
+    def begin(self) -> None:
+        self.started = time.perf_counter()
+        if self.first_started is None:
+            self.first_started = self.started
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+
+    @property
+    def deadline(self) -> float | None:
+        # The clock starts when a worker picks the attempt up, not while it is queued.
+        if self.task.timeout_s is None or self.started is None:
+            return None
+        return self.started + self.task.timeout_s
 
 
 @dataclass
 class TaskRunner:
     tasks: List[Task] = field(default_factory=list)
+    max_workers: int = 4
+    backend: str = "thread"
+    # A caller-owned pool to run on; it is reused across runs and never shut down here.
+    executor: Executor | None = field(default=None, repr=False)
+    _cancelled: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _progress: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
 
     def add(self, task: Task) -> None:
         self.tasks.append(task)
 
+    def cancel(self) -> None:
+        self._cancelled.set()
+
     def run_all(self) -> List[TaskResult]:
-        results: List[TaskResult] = []
+        by_name = {result.name: result for result in self._execute()}
+        return [by_name[task.name] for task in self.tasks]
+
+    def iter_results(self, max_in_flight: int | None = None) -> Iterator[TaskResult]:
+        # Tasks are only submitted while the caller is pulling, so a slow consumer
+        # holds back new work instead of piling up finished results.
+        return self._execute(max_in_flight)
+
+    async def aiter_results(self, max_in_flight: int | None = None) -> AsyncIterator[TaskResult]:
+        import asyncio  # deferred: only async callers pay for loading it
+
+        results = self._execute(max_in_flight)
+        try:
+            while True:
+                result = await asyncio.to_thread(next, results, _END)
+                if result is _END:
+                    return
+                yield result
+        finally:
+            await asyncio.to_thread(results.close)
+
+    def progress(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._progress)
+
+    def _count(self, **changes: int) -> None:
+        with self._lock:
+            for key, delta in changes.items():
+                self._progress[key] = self._progress.get(key, 0) + delta
+
+    def _validate(self) -> Dict[str, Task]:
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown task backend: {self.backend}")
+        tasks: Dict[str, Task] = {}
+        for task in self.tasks:
+            if task.name in tasks:
+                raise ValueError(f"Duplicate task name: {task.name}")
+            tasks[task.name] = task
         for task in self.tasks:
-            results.append(TaskResult(name=task.name, output=task.action()))
-        return results
+            for dependency in task.depends_on:
+                if dependency not in tasks:
+                    raise ValueError(f"Task {task.name} depends on unknown task {dependency}")
+
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through task {name}")
+            visiting.add(name)
+            for dependency in tasks[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in tasks:
+            visit(name)
+        return tasks
+
+    def _executor(self) -> Executor:
+        if self.executor is not None:
+            return self.executor
+        # Process attempts are also driven from threads; each thread waits on its own child.
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task")
+
+    def _execute(self, max_in_flight: int | None = None) -> Iterator[TaskResult]:
+        tasks = self._validate()
+        self._cancelled.clear()
+        with self._lock:
+            self._progress = {"total": len(tasks), "running": 0, "finished": 0}
+        limit = max(1, max_in_flight) if max_in_flight is not None else len(tasks) or 1
+        waiting_on = {name: set(task.depends_on) for name, task in tasks.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in tasks}
+        for task in tasks.values():
+            for dependency in task.depends_on:
+                dependents[dependency].append(task.name)
+
+        ready: Deque[Tuple[Task, int, float | None]] = deque(
+            (task, 1, None) for task in self.tasks if not task.depends_on
+        )
+        running: Dict[Future, _Attempt] = {}
+        finished: set[str] = set()
+        executor = self._executor()
+
+        def settle(result: TaskResult) -> List[TaskResult]:
+            # Record a final result and release or skip everything downstream of it.
+            settled = [result]
+            finished.add(result.name)
+            for name in dependents[result.name]:
+                if name in finished:
+                    continue
+                if result.ok:
+                    waiting_on[name].discard(result.name)
+                    if not waiting_on[name]:
+                        ready.append((tasks[name], 1, None))
+                else:
+                    settled.extend(
+                        settle(
+                            TaskResult(
+                                name=name,
+                                status=SKIPPED,
+                                error=f"Dependency {result.name} {result.status}",
+                                attempts=0,
+                            )
+                        )
+                    )
+            return settled
+
+        def retry_or_fail(attempt: _Attempt, status: str, error: str) -> List[TaskResult]:
+            if attempt.number <= attempt.task.retries and not self._cancelled.is_set():
+                ready.appendleft((attempt.task, attempt.number + 1, attempt.first_started))
+                return []
+            return settle(
+                TaskResult(
+                    name=attempt.task.name,
+                    status=status,
+                    duration_ms=_elapsed_ms(attempt.first_started),
+                    error=error,
+                    attempts=attempt.number,
+                )
+            )
+
+        try:
+            while ready or running:
+                if self._cancelled.is_set():
+                    for future in running:
+                        future.cancel()
+                    self._count(running=-len(running))
+                    for name in tasks:
+                        if name not in finished:
+                            finished.add(name)
+                            yield self._report(TaskResult(name=name, status=CANCELLED, attempts=0))
+                    return
+
+                while ready and len(running) < limit:
+                    task, number, first_started = ready.popleft()
+                    attempt = _Attempt(task, number, first_started=first_started)
+                    run = _run_in_process if self.backend == "process" else _run_attempt
+                    # Counted first: an inline executor finishes the attempt inside submit().
+                    self._count(running=1)
+                    future = executor.submit(run, attempt)
+                    running[future] = attempt
+
+                now = time.perf_counter()
+                deadlines = [a.deadline for a in running.values() if a.deadline is not None]
+                timeout = min([_POLL_S] + [max(0.0, d - now) for d in deadlines])
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                settled: List[TaskResult] = []
+                self._count(running=-len(done))
+                for future in done:
+                    attempt = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as exc:
+                        settled += retry_or_fail(attempt, FAILED, f"{type(exc).__name__}: {exc}")
+                    else:
+                        settled += settle(
+                            TaskResult(
+                                name=attempt.task.name,
+                                output=output,
+                                duration_ms=_elapsed_ms(attempt.first_started),
+                                attempts=attempt.number,
+                            )
+                        )
+
+                now = time.perf_counter()
+                for future, attempt in list(running.items()):
+                    if attempt.deadline is not None and now >= attempt.deadline:
+                        # Threads cannot be interrupted; the attempt is abandoned, not killed.
+                        # A child process is killed, which frees its worker for the retry.
+                        future.cancel()
+                        attempt.kill()
+                        del running[future]
+                        self._count(running=-1)
+                        message = f"Timed out after {attempt.task.timeout_s}s"
+                        settled += retry_or_fail(attempt, TIMED_OUT, message)
+
+                for result in settled:
+                    yield self._report(result)
+        finally:
+            for future, attempt in running.items():
+                future.cancel()
+                attempt.kill()
+            if executor is not self.executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _report(self, result: TaskResult) -> TaskResult:
+        self._count(finished=1, **{result.status: 1})
+        return result
+
+
+def _run_attempt(attempt: _Attempt) -> str:
+    attempt.begin()
+    return attempt.task.action()
+
+
+def _process_main(conn: Any, action: Callable[[], str]) -> None:
+    try:
+        reply = (True, action())
+    except Exception as exc:
+        reply = (False, exc)
+    try:
+        conn.send(reply)
+    except Exception as exc:
+        # The output or the exception could not be pickled; report that instead.
+        conn.send((False, RuntimeError(f"{type(exc).__name__}: {exc}")))
+    conn.close()
+
+
+def _run_in_process(attempt: _Attempt) -> str:
+    import multiprocessing  # deferred: only the process backend pays for loading it
+
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    attempt.process = context.Process(
+        target=_process_main,
+        args=(sender, attempt.task.action),
+        name=f"task-{attempt.task.name}",
+        daemon=True,
+    )
+    attempt.process.start()
+    sender.close()
+    attempt.begin()
+    try:
+        ok, value = receiver.recv()
+    except EOFError:
+        raise RuntimeError(
+            f"Task process exited with code {attempt.process.exitcode}"
+        ) from None
+    finally:
+        receiver.close()
+        attempt.process.join()
+    if not ok:
+        raise value
+    return value
+
+
+def _elapsed_ms(started: float | None) -> float:
+    if started is None:
+        return 0.0
+    return round((time.perf_counter() - started) * 1000, 3)
@@ -5,6 +5,7 @@ import os
 import shlex
 import subprocess
 import sys
+import time
 import webbrowser
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,6 +13,8 @@ from typing import Any, Dict, List
 from urllib.parse import quote_plus
 
 from openclaw_local.config import ToolConfig
+from openclaw_local.metrics import TOOL_SECONDS
+from openclaw_local.tracing import TRACER
 
 
 @dataclass
@@ -139,6 +142,13 @@ class ToolExecutor:
         return ToolResult(True, f"Opened URL: {url}")
 
     def execute(self, tool: str, args: Dict[str, Any]) -> ToolResult:
+        started = time.perf_counter()
+        with TRACER.span("tool.execute", tool=tool):
+            result = self._dispatch(tool, args)
+        TOOL_SECONDS.observe(time.perf_counter() - started, tool=tool, ok=str(result.ok).lower())
+        return result
+
+    def _dispatch(self, tool: str, args: Dict[str, Any]) -> ToolResult:
         if tool == "list_dir":
             return self.list_dir(path=args.get("path"))
         if tool == "read_file":
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import contextvars
+import cProfile
+import itertools
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Deque, Dict, Iterator, List
+
+from openclaw_local.config import DiagnosticsConfig
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: str | None
+    started_at: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: float | None = None
+    error: str | None = None
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+            "thread": self.thread,
+        }
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    spans: List[Span] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "root": spans[0].name if spans else None,
+            "duration_ms": spans[0].duration_ms if spans else None,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+
+_current: contextvars.ContextVar[tuple[Trace, Span] | None] = contextvars.ContextVar(
+    "openclaw_span",
+    default=None,
+)
+
+
+class Tracer:
+    def __init__(self, capacity: int = 200) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._traces: Deque[Trace] = deque(maxlen=capacity)
+
+    def configure(self, enabled: bool, capacity: int | None = None) -> None:
+        with self._lock:
+            self.enabled = enabled
+            if capacity is not None and capacity != self._traces.maxlen:
+                self._traces = deque(self._traces, maxlen=capacity)
+
+    def current_trace_id(self) -> str | None:
+        current = _current.get()
+        return current[0].trace_id if current is not None else None
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Any]:
+        # Spans only attach to a trace someone started; on their own they record nothing.
+        if not self.enabled or _current.get() is None:
+            return _NULL_SPAN
+        return self._span(name, None, attributes)
+
+    def trace(self, name: str, trace_id: str | None = None, **attributes: Any) -> ContextManager[Any]:
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, trace_id or uuid.uuid4().hex, attributes)
+
+    @contextlib.contextmanager
+    def _span(
+        self,
+        name: str,
+        trace_id: str | None,
+        attributes: Dict[str, Any],
+    ) -> Iterator[Span]:
+        current = _current.get()
+        if trace_id is not None or current is None:
+            trace = Trace(trace_id=trace_id or uuid.uuid4().hex)
+            parent_id = None
+        else:
+            trace, parent = current
+            parent_id = parent.span_id
+        span = Span(
+            name=name,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent_id,
+            started_at=time.time(),
+            attributes=attributes,
+        )
+        trace.spans.append(span)
+        if parent_id is None:
+            with self._lock:
+                self._traces.append(trace)
+        token = _current.set((trace, span))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            _current.reset(token)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._traces)[-limit:]
+        return [trace.to_dict() for trace in reversed(traces)]
+
+
+class Profiler:
+    def __init__(self, every: int = 0, directory: Path = Path("profiles")) -> None:
+        self.every = every
+        self.directory = directory
+        self._counter = itertools.count(1)
+        # Only one cProfile session can be active at a time on newer Pythons.
+        self._active = threading.Lock()
+
+    def sample(self, label: str) -> ContextManager[Any]:
+        if self.every <= 0:
+            return _NULL_SPAN
+        number = next(self._counter)
+        if number % self.every != 0 or not self._active.acquire(blocking=False):
+            return _NULL_SPAN
+        return self._profile(label, number)
+
+    @contextlib.contextmanager
+    def _profile(self, label: str, number: int) -> Iterator[None]:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_") or "request"
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            profile.dump_stats(self.directory / f"{stamp}-{number:06d}-{safe}.pstats")
+        finally:
+            self._active.release()
+
+
+TRACER = Tracer()
+
+
+def add_diagnostics_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DiagnosticsConfig()
+    parser.add_argument("--trace", action="store_true", help="Record request traces")
+    parser.add_argument(
+        "--trace-buffer",
+        type=int,
+        default=defaults.trace_buffer,
+        help="Number of recent traces kept for /api/traces",
+    )
+    parser.add_argument(
+        "--profile-every",
+        type=int,
+        default=defaults.profile_every,
+        help="Run cProfile on every Nth request and chat turn (0 disables)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(defaults.profile_dir),
+        help="Directory for .pstats profile dumps",
+    )
+
+
+def diagnostics_config_from_args(args: argparse.Namespace) -> DiagnosticsConfig:
+    return DiagnosticsConfig(
+        trace=args.trace,
+        trace_buffer=max(1, args.trace_buffer),
+        profile_every=max(0, args.profile_every),
+        profile_dir=Path(args.profile_dir),
+    )
@@ -1,16 +1,49 @@
 from __future__ import annotations
 
 import argparse
+import re
 import threading
+import time
 import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import ExitStack
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
 
-from flask import Flask, Response, jsonify, render_template_string, request
+from flask import Flask, Response, g, jsonify, render_template_string, request
 
 from openclaw_local.agent import OpenClawAgent
-from openclaw_local.config import AppConfig, ModelConfig
-from openclaw_local.vision import VisionService
+from openclaw_local.assets import StaticAsset
+from openclaw_local.config import DEFAULT_DB_PATH, AppConfig, ChatStoreConfig, ModelConfig
+from openclaw_local.jobs import CANCELLED, DONE, Job, JobQueue
+from openclaw_local.messages import VISIBLE, MessageLog
+from openclaw_local.metrics import HTTP_REQUEST_SECONDS, REGISTRY
+from openclaw_local.profiles import DEFAULT_PROFILE, PROFILES, get_profile
+from openclaw_local.router import router_for
+from openclaw_local.scheduler import Interval, Scheduler
+from openclaw_local.search import SearchIndex
+from openclaw_local.serving import add_server_arguments, serve, server_config_from_args
+from openclaw_local.storage import ChatStorage
+from openclaw_local.tasks import Task
+from openclaw_local.tracing import (
+    TRACER,
+    Profiler,
+    add_diagnostics_arguments,
+    diagnostics_config_from_args,
+)
+from openclaw_local.vision import (
+    AdaptiveJpegController,
+    EncoderSettings,
+    LandmarkEncoder,
+    VisionService,
+)
+
+
+_TRACE_ID = re.compile(r"[A-Za-z0-9-]{8,64}")
+STATUS_MAX_AGE_S = 5.0
+SETTINGS_WAIT_S = 30.0
 
 
 @dataclass
@@ -18,45 +51,115 @@ class ChatSession:
     chat_id: str
     title: str
     model: str
-    messages: list[dict[str, str]] = field(default_factory=list)
+    profile: str = DEFAULT_PROFILE
+    log: MessageLog | None = field(default_factory=MessageLog)
     agent: OpenClawAgent | None = None
+    message_count: int = 0
+    revision: int = 0
+    context_start: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    busy: int = 0
 
 
 class ChatStore:
-    def __init__(self, base_config: AppConfig) -> None:
+    def __init__(self, base_config: AppConfig, storage: ChatStorage | None = None) -> None:
         self._base_config = base_config
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self._sessions: dict[str, ChatSession] = {}
-        self.create_chat(title="New Chat", model=base_config.model.model)
+        self._live: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._revision = 0
+        self._status_agent: OpenClawAgent | None = None
+        self._status_cache: Tuple[float, Dict[str, Any]] | None = None
+        self.evictions = 0
+        self.rebuilds = 0
+        if storage is None and base_config.chats.db_path is not None:
+            storage = ChatStorage(base_config.chats.db_path)
+        self._storage = storage
+        self._index = SearchIndex() if storage is None else None
+
+        if storage is not None:
+            for record in storage.load_chats():
+                self._sessions[record.chat_id] = ChatSession(
+                    chat_id=record.chat_id,
+                    title=record.title,
+                    model=record.model,
+                    profile=record.profile if record.profile in PROFILES else DEFAULT_PROFILE,
+                    log=None,
+                    message_count=record.message_count,
+                    context_start=record.context_start,
+                )
+        if not self._sessions:
+            self.create_chat(
+                title="New Chat",
+                model=base_config.model.model,
+                profile=base_config.model.profile,
+            )
+
+    @property
+    def storage(self) -> ChatStorage | None:
+        return self._storage
 
-    def _build_agent(self, model: str) -> OpenClawAgent:
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def _build_agent(
+        self,
+        model: str,
+        log: MessageLog | None = None,
+        affinity: str | None = None,
+        profile: str | None = None,
+    ) -> OpenClawAgent:
         config = AppConfig(
             tool=self._base_config.tool,
             model=ModelConfig(
                 base_url=self._base_config.model.base_url,
                 model=model,
                 request_timeout_s=self._base_config.model.request_timeout_s,
+                base_urls=self._base_config.model.base_urls,
+                profile=profile or self._base_config.model.profile,
             ),
         )
-        return OpenClawAgent(config)
+        return OpenClawAgent(config, log=log, affinity=affinity)
+
+    def _attach(self, session: ChatSession, log: MessageLog) -> None:
+        def on_append(seq: int, role: str, content: str, flags: int) -> None:
+            with self._lock:
+                session.message_count = seq + 1
+                session.revision += 1
+            if self._storage is not None:
+                self._storage.append_message(session.chat_id, seq, role, content, flags)
+            elif flags & VISIBLE:
+                self._index.add(session.chat_id, seq, role, content)
+
+        log.listener = on_append
+
+    def _save(self, session: ChatSession) -> None:
+        if self._storage is not None:
+            self._storage.save_chat(
+                session.chat_id,
+                session.title,
+                session.model,
+                session.context_start,
+                profile=session.profile,
+            )
 
-    def create_chat(self, title: str, model: str) -> ChatSession:
+    def create_chat(self, title: str, model: str, profile: str = DEFAULT_PROFILE) -> ChatSession:
+        get_profile(profile)
         chat_id = str(uuid.uuid4())
-        session = ChatSession(
-            chat_id=chat_id,
-            title=title,
-            model=model,
-            messages=[],
-            agent=self._build_agent(model),
-        )
+        session = ChatSession(chat_id=chat_id, title=title, model=model, profile=profile)
+        self._attach(session, session.log)
         with self._lock:
             self._sessions[chat_id] = session
+            self._revision += 1
+            self._touch(session)
+        self._save(session)
         return session
 
     def list_chats(self) -> list[dict[str, str]]:
         with self._lock:
             return [
-                {"id": s.chat_id, "title": s.title, "model": s.model}
+                {"id": s.chat_id, "title": s.title, "model": s.model, "profile": s.profile}
                 for s in self._sessions.values()
             ]
 
@@ -64,6 +167,207 @@ class ChatStore:
         with self._lock:
             return self._sessions.get(chat_id)
 
+    def _default_agent(self) -> OpenClawAgent:
+        with self._lock:
+            if self._status_agent is None:
+                self._status_agent = self._build_agent(self._base_config.model.model)
+            return self._status_agent
+
+    def status(self, max_age_s: float = STATUS_MAX_AGE_S) -> Dict[str, Any]:
+        # Reuse a recent successful check so page loads and warm-up share one catalog call.
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - cached[0] < max_age_s:
+            return cached[1]
+        status = self._default_agent().status()
+        self._status_cache = (time.monotonic(), status) if status.get("ok") else None
+        return status
+
+    def load_default_model(self) -> None:
+        self._default_agent().load_model()
+
+    def agent_for(self, session: ChatSession) -> OpenClawAgent:
+        log = self.log(session)
+        with self._lock:
+            self._touch(session)
+            if session.agent is None:
+                # Keyed on the chat id so a rebuilt agent lands on the same backend.
+                session.agent = self._build_agent(
+                    session.model,
+                    log,
+                    affinity=session.chat_id,
+                    profile=session.profile,
+                )
+                if session.message_count > session.context_start:
+                    self.rebuilds += 1
+            return session.agent
+
+    def set_model(self, session: ChatSession, model: str) -> None:
+        log = self.log(session)
+        log.append(
+            "assistant",
+            f"Switched model to {model}. New context started for this chat.",
+            flags=VISIBLE,
+        )
+        log.reset_context()
+        with self._lock:
+            session.model = model
+            session.agent = None
+            session.context_start = log.context_start
+            session.revision += 1
+            self._revision += 1
+        self._save(session)
+
+    def set_profile(self, session: ChatSession, profile: str) -> None:
+        get_profile(profile)
+        with self._lock:
+            # Unlike a model switch the context carries over; only the options change.
+            session.profile = profile
+            session.agent = None
+            session.revision += 1
+            self._revision += 1
+        self._save(session)
+
+    def run_turn(self, session: ChatSession, message: str) -> str:
+        with self._lock:
+            session.busy += 1
+        try:
+            return self.agent_for(session).ask(message)
+        finally:
+            with self._lock:
+                session.busy -= 1
+
+    def log(self, session: ChatSession) -> MessageLog:
+        with self._lock:
+            if session.log is not None:
+                self._touch(session)
+                return session.log
+        assert self._storage is not None
+        loaded = MessageLog(
+            self._storage.load_records(session.chat_id),
+            context_start=session.context_start,
+        )
+        with self._lock:
+            if session.log is None:
+                self._attach(session, loaded)
+                session.log = loaded
+            # Touch before handing the log out so eviction cannot detach it in between.
+            self._touch(session)
+            return session.log
+
+    def messages(self, session: ChatSession) -> list[dict[str, str]]:
+        return self.log(session).visible()
+
+    def page_messages(
+        self,
+        session: ChatSession,
+        before: int | None = None,
+        limit: int | None = None,
+        since: int | None = None,
+    ) -> tuple[int, int, list[dict[str, str]]]:
+        total = session.message_count
+        if since is not None:
+            start, stop = min(max(0, since), total), total
+        else:
+            stop = total if before is None else min(max(0, before), total)
+            start = 0
+        log = session.log
+        if since is None and limit is not None:
+            # The limit counts visible messages, so hidden records never shorten a page.
+            limit = max(0, limit)
+            if log is not None:
+                start, messages = log.last_visible(limit, stop)
+            elif self._storage is not None:
+                start, messages = self._storage.load_last_visible(session.chat_id, limit, stop)
+            else:
+                start, messages = 0, []
+            return start, stop, messages
+        if log is not None:
+            return start, stop, log.visible(start, stop)
+        if self._storage is None:
+            return start, stop, []
+        return start, stop, self._storage.load_messages(session.chat_id, start, stop)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[dict[str, Any]]:
+        if self._storage is not None:
+            hits = self._storage.search(query, limit, offset)
+        else:
+            hits = self._index.search(query, limit, offset)
+        results = []
+        with self._lock:
+            for hit in hits:
+                session = self._sessions.get(hit.chat_id)
+                if session is not None:
+                    results.append({**hit.to_dict(), "title": session.title})
+        return results
+
+    def append_message(
+        self,
+        session: ChatSession,
+        role: str,
+        content: str,
+        flags: int = VISIBLE,
+    ) -> None:
+        self.log(session).append(role, content, flags=flags)
+
+    def _touch(self, session: ChatSession) -> None:
+        session.last_used = time.monotonic()
+        self._live[session.chat_id] = session
+        self._live.move_to_end(session.chat_id)
+        self._enforce_limits(keep=session.chat_id)
+
+    def _is_live(self, session: ChatSession) -> bool:
+        if session.agent is not None:
+            return True
+        return self._storage is not None and session.log is not None
+
+    def _evict(self, session: ChatSession) -> None:
+        session.agent = None
+        if self._storage is not None:
+            session.log = None
+        self._live.pop(session.chat_id, None)
+        self.evictions += 1
+
+    def _enforce_limits(self, keep: str | None = None) -> None:
+        settings = self._base_config.chats
+        cutoff = None
+        if settings.idle_timeout_s is not None:
+            cutoff = time.monotonic() - settings.idle_timeout_s
+        excess = len(self._live) - max(1, settings.max_live_sessions)
+        for chat_id, session in list(self._live.items()):
+            if chat_id == keep or session.busy:
+                continue
+            if not self._is_live(session):
+                self._live.pop(chat_id, None)
+                excess -= 1
+                continue
+            if excess > 0:
+                self._evict(session)
+                excess -= 1
+            elif cutoff is not None and session.last_used < cutoff:
+                self._evict(session)
+            else:
+                break
+
+    def evict_idle(self) -> None:
+        with self._lock:
+            self._enforce_limits()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live = sum(1 for session in self._sessions.values() if self._is_live(session))
+            return {
+                "sessions": len(self._sessions),
+                "live": live,
+                "agents": sum(1 for session in self._sessions.values() if session.agent is not None),
+                "evictions": self.evictions,
+                "rebuilds": self.rebuilds,
+                "max_live_sessions": self._base_config.chats.max_live_sessions,
+            }
+
+    def close(self) -> None:
+        if self._storage is not None:
+            self._storage.close()
+
 
 CAMERA_TEMPLATE = """
 <!doctype html>
@@ -190,6 +494,10 @@ HTML_TEMPLATE = """
             <label for="modelSelect">Model for current chat</label>
             <select id="modelSelect"></select>
           </div>
+          <div class="setting-row">
+            <label for="profileSelect">Response profile</label>
+            <select id="profileSelect"></select>
+          </div>
         </div>
 
         <div class="setting-card">
@@ -203,6 +511,8 @@ HTML_TEMPLATE = """
   let chats = [];
   let activeChatId = null;
   let models = [];
+  let renderedChatId = null;
+  let renderedCount = 0;
 
   const chatList = document.getElementById('chatList');
   const messages = document.getElementById('messages');
@@ -210,6 +520,7 @@ HTML_TEMPLATE = """
   const activeTitle = document.getElementById('activeTitle');
   const activeModelBadge = document.getElementById('activeModelBadge');
   const modelSelect = document.getElementById('modelSelect');
+  const profileSelect = document.getElementById('profileSelect');
   const prompt = document.getElementById('prompt');
   const sendBtn = document.getElementById('send');
   const themeSelect = document.getElementById('themeSelect');
@@ -269,17 +580,24 @@ HTML_TEMPLATE = """
     }
   }
 
-  function renderMessages(list) {
-    messages.innerHTML = '';
+  function appendMessages(list) {
+    if (!list.length) return;
+    const fragment = document.createDocumentFragment();
     for (const m of list) {
       const b = document.createElement('div');
       b.className = `bubble ${m.role}`;
       b.textContent = m.content;
-      messages.appendChild(b);
+      fragment.appendChild(b);
     }
+    messages.appendChild(fragment);
     messages.scrollTop = messages.scrollHeight;
   }
 
+  function renderMessages(list) {
+    messages.innerHTML = '';
+    appendMessages(list);
+  }
+
   async function loadStatus() {
     const data = await safeFetchJson('/api/status');
     if (data && data.ok) {
@@ -300,6 +618,17 @@ HTML_TEMPLATE = """
     }
   }
 
+  async function loadProfiles() {
+    const data = await safeFetchJson('/api/profiles');
+    profileSelect.innerHTML = '';
+    for (const profile of (data && data.profiles) || []) {
+      const o = document.createElement('option');
+      o.value = profile.name;
+      o.textContent = `${profile.name} (${profile.num_predict} tokens max)`;
+      profileSelect.appendChild(o);
+    }
+  }
+
   async function loadChats() {
     const data = await safeFetchJson('/api/chats');
     chats = (data && data.chats) ? data.chats : [];
@@ -309,14 +638,24 @@ HTML_TEMPLATE = """
   }
 
   async function loadChat(chatId) {
-    const data = await safeFetchJson(`/api/chats/${chatId}`);
+    const incremental = chatId === renderedChatId;
+    const url = incremental ? `/api/chats/${chatId}?since=${renderedCount}` : `/api/chats/${chatId}`;
+    const data = await safeFetchJson(url);
     if (!data) return;
+    const switched = data.id !== activeChatId;
     activeChatId = data.id;
     activeTitle.textContent = data.title;
     activeModelBadge.textContent = `Model: ${data.model}`;
-    renderChats();
-    renderMessages(data.messages || []);
+    if (switched || !incremental) renderChats();
+    if (incremental) {
+      appendMessages(data.messages || []);
+    } else {
+      renderMessages(data.messages || []);
+    }
+    renderedChatId = data.id;
+    renderedCount = data.cursor;
     if (modelSelect.options.length) modelSelect.value = data.model;
+    if (profileSelect.options.length) profileSelect.value = data.profile;
   }
 
   document.getElementById('newChat').onclick = async () => {
@@ -324,7 +663,7 @@ HTML_TEMPLATE = """
     const data = await safeFetchJson('/api/chats', {
       method:'POST',
       headers:{'Content-Type':'application/json'},
-      body: JSON.stringify({title:'New Chat', model})
+      body: JSON.stringify({title:'New Chat', model, profile: profileSelect.value || undefined})
     });
     if (!data) return;
     chats.push(data);
@@ -349,22 +688,43 @@ HTML_TEMPLATE = """
     await loadChats();
   };
 
+  profileSelect.onchange = async () => {
+    if (!activeChatId) return;
+    await safeFetchJson(`/api/chats/${activeChatId}/profile`, {
+      method:'POST',
+      headers:{'Content-Type':'application/json'},
+      body: JSON.stringify({profile:profileSelect.value})
+    });
+    await loadChat(activeChatId);
+  };
+
+  async function waitForJob(jobId, chatId) {
+    while (true) {
+      const job = await safeFetchJson(`/api/jobs/${jobId}/result?timeout=20`);
+      if (!job || !['queued', 'running'].includes(job.status)) return job;
+      if (chatId === activeChatId) await loadChat(chatId);
+    }
+  }
+
   document.getElementById('composer').onsubmit = async (e) => {
     e.preventDefault();
     const message = prompt.value.trim();
-    if (!message || !activeChatId) return;
+    const chatId = activeChatId;
+    if (!message || !chatId) return;
     prompt.value = '';
     sendBtn.disabled = true;
+    let job = null;
     try {
-      await safeFetchJson(`/api/chats/${activeChatId}/messages`, {
+      job = await safeFetchJson(`/api/chats/${chatId}/messages`, {
         method:'POST',
         headers:{'Content-Type':'application/json'},
         body: JSON.stringify({message})
       });
-      await loadChat(activeChatId);
     } finally {
       sendBtn.disabled = false;
     }
+    if (job && job.job_id) await waitForJob(job.job_id, chatId);
+    if (chatId === activeChatId) await loadChat(chatId);
   };
 
   themeSelect.onchange = () => applyTheme(themeSelect.value, accentPicker.value);
@@ -376,7 +736,7 @@ HTML_TEMPLATE = """
     themeSelect.value = savedTheme;
     accentPicker.value = savedAccent;
     applyTheme(savedTheme, savedAccent);
-    await loadStatus();
+    await Promise.all([loadStatus(), loadProfiles()]);
     await loadChats();
     showChat();
   })();
@@ -386,81 +746,306 @@ HTML_TEMPLATE = """
 """
 
 
+def _camera_page(vision: VisionService) -> str:
+    support = vision.support()
+    if not support.ok:
+        missing = []
+        if not support.cv2_available:
+            missing.append("opencv-python")
+        if not support.mediapipe_available:
+            missing.append("mediapipe")
+        content = (
+            f'<div class="error">Missing dependencies: {", ".join(missing)}. '
+            'Install requirements-vision.txt.</div>'
+        )
+        return CAMERA_TEMPLATE.replace("__CONTENT__", content)
+    return CAMERA_TEMPLATE.replace("__CONTENT__", '<img src="/video_feed" alt="live camera" />')
+
+
+# The metrics registry is process-wide, so its gauges sum over every app not yet shut down.
+_LIVE_APPS: "weakref.WeakSet[Flask]" = weakref.WeakSet()
+
+
+def _live_total(measure: Callable[[Flask], float]) -> float:
+    return sum(measure(app) for app in list(_LIVE_APPS))
+
+
+def _pending_writes(app: Flask) -> int:
+    storage = app.extensions["openclaw_store"].storage
+    return storage.pending_writes() if storage else 0
+
+
+REGISTRY.gauge("openclaw_job_queue_depth", "Chat turns waiting for a worker.").set_function(
+    lambda: _live_total(lambda app: app.extensions["openclaw_jobs"].depth())
+)
+REGISTRY.gauge("openclaw_jobs_running", "Chat turns currently running.").set_function(
+    lambda: _live_total(lambda app: app.extensions["openclaw_jobs"].running())
+)
+REGISTRY.gauge("openclaw_live_sessions", "Chat sessions held in memory.").set_function(
+    lambda: _live_total(lambda app: app.extensions["openclaw_store"].stats()["live"])
+)
+REGISTRY.gauge(
+    "openclaw_storage_pending_writes",
+    "Chat history writes waiting to be committed.",
+).set_function(lambda: _live_total(_pending_writes))
+
+
+def _configure_tracer() -> None:
+    # The tracer is shared by the whole process: it runs while any live app traces, with the
+    # largest buffer any of them asked for. Each app only starts traces for its own requests.
+    settings = [app.extensions["openclaw_diagnostics"] for app in list(_LIVE_APPS)]
+    wanted = [diagnostics for diagnostics in settings if diagnostics.trace]
+    TRACER.configure(bool(wanted), max((d.trace_buffer for d in wanted), default=None))
+
+
 def create_app(config: AppConfig) -> Flask:
     app = Flask(__name__)
     vision = VisionService()
     store = ChatStore(config)
+    jobs = JobQueue(max_workers=config.chats.max_concurrent_turns)
+    app.extensions["openclaw_store"] = store
+    app.extensions["openclaw_jobs"] = jobs
+    scheduler = Scheduler(max_workers=2)
+    app.extensions["openclaw_scheduler"] = scheduler
+    scheduler.add(
+        Task(name="evict-idle-sessions", action=store.evict_idle),
+        Interval(60),
+        jitter_s=5,
+    )
+    if config.model.base_urls:
+        scheduler.add(
+            Task(name="ollama-health-check", action=router_for(config.model.backends).refresh),
+            Interval(15),
+            jitter_s=2,
+            run_now=True,
+        )
+    scheduler.start()
+
+    diagnostics = config.diagnostics
+    app.extensions["openclaw_diagnostics"] = diagnostics
+    _LIVE_APPS.add(app)
+    _configure_tracer()
+    profiler = Profiler(diagnostics.profile_every, diagnostics.profile_dir)
+
+    @app.before_request
+    def start_timer() -> None:
+        g.request_started = time.perf_counter()
+        if diagnostics.trace or profiler.every:
+            scope = ExitStack()
+            scope.enter_context(profiler.sample(f"{request.method}-{request.path}"))
+            if diagnostics.trace:
+                incoming = request.headers.get("X-Trace-Id", "")
+                scope.enter_context(
+                    TRACER.trace(
+                        f"{request.method} {request.path}",
+                        trace_id=incoming if _TRACE_ID.fullmatch(incoming) else None,
+                    )
+                )
+            g.request_scope = scope
+
+    @app.after_request
+    def tag_response(response: Response) -> Response:
+        g.response_status = response.status_code
+        trace_id = TRACER.current_trace_id()
+        if trace_id is not None:
+            response.headers["X-Trace-Id"] = trace_id
+        return response
+
+    @app.teardown_request
+    def close_request_scope(_exc: BaseException | None) -> None:
+        # Teardown also runs for requests that raised, which never reach after_request.
+        started = g.pop("request_started", None)
+        if started is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                route=rule,
+                method=request.method,
+                status=g.pop("response_status", 500),
+            )
+        scope = g.pop("request_scope", None)
+        if scope is not None:
+            scope.close()
+
+    def traced_turn(session: ChatSession, message: str) -> str:
+        with profiler.sample("chat-turn"), TRACER.span("chat.turn", chat_id=session.chat_id):
+            return store.run_turn(session, message)
+
+    with app.app_context():
+        index_asset = StaticAsset.build(render_template_string(HTML_TEMPLATE))
+        camera_asset = StaticAsset.build(render_template_string(_camera_page(vision)))
 
     @app.get("/")
-    def index() -> str:
-        return render_template_string(HTML_TEMPLATE)
+    def index() -> Response:
+        return index_asset.response(request)
 
     @app.get("/favicon.ico")
     def favicon() -> tuple[str, int]:
         return "", 204
 
     @app.get("/camera")
-    def camera_page() -> str:
-        support = vision.support()
-        if not support.ok:
-            missing = []
-            if not support.cv2_available:
-                missing.append("opencv-python")
-            if not support.mediapipe_available:
-                missing.append("mediapipe")
-            content = (
-                f'<div class="error">Missing dependencies: {", ".join(missing)}. '
-                'Install requirements-vision.txt.</div>'
-            )
-            return render_template_string(CAMERA_TEMPLATE.replace("__CONTENT__", content))
-        return render_template_string(
-            CAMERA_TEMPLATE.replace("__CONTENT__", '<img src="/video_feed" alt="live camera" />')
-        )
+    def camera_page() -> Response:
+        return camera_asset.response(request)
 
     @app.get("/video_feed")
     def video_feed() -> Response:
         support = vision.support()
         if not support.ok:
             return Response("Vision dependencies missing", status=503)
+        defaults = EncoderSettings()
+        max_width = request.args.get("max_width", type=int)
+        kbps = request.args.get("kbps", type=int)
+        min_width = AdaptiveJpegController.MIN_WIDTH
+        settings = EncoderSettings(
+            quality=min(100, max(10, request.args.get("quality", defaults.quality, type=int))),
+            max_width=None if max_width is None else min(7680, max(min_width, max_width)),
+            target_kbps=None if kbps is None else min(100_000, max(64, kbps)),
+        )
         return Response(
-            vision.stream_mjpeg(),
+            vision.stream_mjpeg(settings),
             mimetype="multipart/x-mixed-replace; boundary=frame",
         )
 
+    @app.get("/landmarks_feed")
+    def landmarks_feed() -> Response:
+        support = vision.support()
+        if not support.ok:
+            return Response("Vision dependencies missing", status=503)
+        quantize = request.args.get("quantize", type=int)
+        delta = request.args.get("delta", "0") in {"1", "true", "yes"}
+        sse = request.args.get("format", "ndjson") == "sse"
+        encoder = LandmarkEncoder(quantize=quantize or None, delta=delta)
+        return Response(
+            vision.stream_landmarks(encoder, sse=sse),
+            mimetype="text/event-stream" if sse else "application/x-ndjson",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    @app.get("/api/vision/stats")
+    def vision_stats() -> Dict[str, Any]:
+        return jsonify(vision.stats())
+
     @app.get("/api/status")
     def status() -> Dict[str, Any]:
-        first = store.list_chats()[0]
-        session = store.get_chat(first["id"])
-        if session is None or session.agent is None:
-            return jsonify({"ok": False, "models": [], "error": "No chat session"})
-        return jsonify(session.agent.status())
+        return jsonify(store.status())
+
+    # Revision counters restart at zero with the process while chats persist, so tag every
+    # ETag with this app instance to keep a pre-restart ETag from matching new content.
+    boot_id = uuid.uuid4().hex[:12]
+
+    def conditional(etag: str, build: Callable[[], Response]) -> Response:
+        etag = f"{boot_id}-{etag}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = build()
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    @app.get("/api/metrics")
+    def metrics() -> Response:
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.get("/api/traces")
+    def traces() -> Dict[str, Any]:
+        limit = min(max(request.args.get("limit", 50, type=int), 1), 1000)
+        if not diagnostics.trace:
+            return jsonify({"enabled": False, "traces": []})
+        return jsonify({"enabled": True, "traces": TRACER.recent(limit)})
+
+    @app.get("/api/schedules")
+    def schedules() -> Dict[str, Any]:
+        return jsonify({"schedules": scheduler.stats()})
+
+    @app.get("/api/tasks")
+    def task_progress() -> Dict[str, Any]:
+        return jsonify({"running": scheduler.progress()})
+
+    @app.get("/api/sessions")
+    def session_stats() -> Dict[str, Any]:
+        return jsonify(store.stats())
 
     @app.get("/api/chats")
-    def chats() -> Dict[str, Any]:
-        return jsonify({"chats": store.list_chats()})
+    def chats() -> Response:
+        return conditional(
+            f"chats-{store.revision}",
+            lambda: jsonify({"chats": store.list_chats()}),
+        )
 
     @app.post("/api/chats")
     def create_chat() -> Dict[str, Any]:
         payload = request.get_json(silent=True) or {}
         title = str(payload.get("title", "New Chat"))
         model = str(payload.get("model", config.model.model))
-        session = store.create_chat(title=title, model=model)
-        return jsonify({"id": session.chat_id, "title": session.title, "model": session.model})
-
-    @app.get("/api/chats/<chat_id>")
-    def get_chat(chat_id: str) -> Dict[str, Any]:
-        session = store.get_chat(chat_id)
-        if session is None:
-            return jsonify({"error": "chat not found"}), 404
+        profile = str(payload.get("profile", config.model.profile))
+        if profile not in PROFILES:
+            return jsonify({"error": f"unknown profile: {profile}"}), 400
+        session = store.create_chat(title=title, model=model, profile=profile)
         return jsonify(
             {
                 "id": session.chat_id,
                 "title": session.title,
                 "model": session.model,
-                "messages": session.messages,
+                "profile": session.profile,
+            }
+        )
+
+    @app.get("/api/search")
+    def search() -> Dict[str, Any]:
+        query = request.args.get("q", "").strip()
+        limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        results = store.search(query, limit + 1, offset) if query else []
+        return jsonify(
+            {
+                "query": query,
+                "results": results[:limit],
+                "offset": offset,
+                "next_offset": offset + limit if len(results) > limit else None,
             }
         )
 
+    @app.get("/api/chats/<chat_id>")
+    def get_chat(chat_id: str) -> Response:
+        session = store.get_chat(chat_id)
+        if session is None:
+            return jsonify({"error": "chat not found"}), 404
+        before = request.args.get("before", type=int)
+        limit = request.args.get("limit", type=int)
+        since = request.args.get("since", type=int)
+
+        def build() -> Response:
+            start, stop, messages = store.page_messages(
+                session,
+                before=before,
+                limit=limit,
+                since=since,
+            )
+            return jsonify(
+                {
+                    "id": session.chat_id,
+                    "title": session.title,
+                    "model": session.model,
+                    "profile": session.profile,
+                    "messages": messages,
+                    "start": start,
+                    "cursor": stop,
+                    "total": session.message_count,
+                }
+            )
+
+        return conditional(f"{chat_id}-{session.revision}-{since}-{before}-{limit}", build)
+
+    def settings_result(job: Job, applied: Dict[str, Any]) -> Response:
+        # Settings changes queue behind the chat's running turn, so they can take a while.
+        if not job.wait(SETTINGS_WAIT_S):
+            return jsonify({"ok": False, **job.to_dict()}), 202
+        if job.status != DONE:
+            status = 409 if job.status == CANCELLED else 500
+            return jsonify({"ok": False, "error": job.error or job.status}), status
+        return jsonify({"ok": True, **applied})
+
     @app.post("/api/chats/<chat_id>/model")
     def set_chat_model(chat_id: str) -> Dict[str, Any]:
         payload = request.get_json(silent=True) or {}
@@ -468,20 +1053,36 @@ def create_app(config: AppConfig) -> Flask:
         session = store.get_chat(chat_id)
         if session is None:
             return jsonify({"error": "chat not found"}), 404
-        session.model = model
-        session.agent = store._build_agent(model)
-        session.messages.append(
+
+        job = jobs.submit(chat_id, lambda: store.set_model(session, model))
+        return settings_result(job, {"model": model})
+
+    @app.get("/api/profiles")
+    def profiles() -> Dict[str, Any]:
+        return jsonify(
             {
-                "role": "assistant",
-                "content": f"Switched model to {model}. New context started for this chat.",
+                "default": config.model.profile,
+                "profiles": [profile.to_dict() for profile in PROFILES.values()],
             }
         )
-        return jsonify({"ok": True, "model": model})
+
+    @app.post("/api/chats/<chat_id>/profile")
+    def set_chat_profile(chat_id: str) -> Dict[str, Any]:
+        payload = request.get_json(silent=True) or {}
+        profile = str(payload.get("profile", config.model.profile))
+        if profile not in PROFILES:
+            return jsonify({"error": f"unknown profile: {profile}"}), 400
+        session = store.get_chat(chat_id)
+        if session is None:
+            return jsonify({"error": "chat not found"}), 404
+
+        job = jobs.submit(chat_id, lambda: store.set_profile(session, profile))
+        return settings_result(job, {"profile": profile})
 
     @app.post("/api/chats/<chat_id>/messages")
     def chat_message(chat_id: str) -> Dict[str, Any]:
         session = store.get_chat(chat_id)
-        if session is None or session.agent is None:
+        if session is None:
             return jsonify({"error": "chat not found"}), 404
 
         payload = request.get_json(silent=True) or {}
@@ -489,32 +1090,122 @@ def create_app(config: AppConfig) -> Flask:
         if not message:
             return jsonify({"reply": "Please enter a message."})
 
-        session.messages.append({"role": "user", "content": message})
-        reply = session.agent.ask(message)
-        session.messages.append({"role": "assistant", "content": reply})
-        return jsonify({"reply": reply})
+        job = jobs.submit(chat_id, lambda: traced_turn(session, message))
+        if not payload.get("wait"):
+            return jsonify({"job_id": job.job_id, "status": job.status}), 202
+        job.wait()
+        if job.status != DONE:
+            return jsonify({"job_id": job.job_id, "error": job.error or job.status}), 500
+        return jsonify({"job_id": job.job_id, "reply": job.result})
+
+    @app.get("/api/jobs/<job_id>")
+    def job_status(job_id: str) -> Dict[str, Any]:
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "job not found"}), 404
+        return jsonify(job.to_dict())
+
+    @app.get("/api/jobs/<job_id>/result")
+    def job_result(job_id: str) -> Dict[str, Any]:
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "job not found"}), 404
+        timeout = min(max(request.args.get("timeout", 0.0, type=float), 0.0), 60.0)
+        if not job.wait(timeout):
+            return jsonify(job.to_dict()), 202
+        if job.status == DONE:
+            return jsonify({**job.to_dict(), "reply": job.result})
+        return jsonify(job.to_dict()), 409 if job.status == CANCELLED else 500
+
+    @app.post("/api/jobs/<job_id>/cancel")
+    def cancel_job(job_id: str) -> Dict[str, Any]:
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "job not found"}), 404
+        cancelled = jobs.cancel(job_id)
+        return jsonify({"ok": cancelled, "status": job.status})
 
     return app
 
 
+def shutdown_app(app: Flask) -> None:
+    _LIVE_APPS.discard(app)
+    _configure_tracer()
+    app.extensions["openclaw_scheduler"].stop()
+    app.extensions["openclaw_jobs"].shutdown()
+    app.extensions["openclaw_store"].close()
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenClaw Local UI server")
     parser.add_argument("--model", default="llama3", help="Ollama model name")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Default generation profile (context size, output length, temperature)",
+    )
     parser.add_argument(
         "--base-url",
         default="http://localhost:11434",
         help="Ollama base URL",
     )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        default=[],
+        help="Another Ollama base URL to load-balance across (repeatable)",
+    )
     parser.add_argument("--host", default="127.0.0.1", help="Bind host")
     parser.add_argument("--port", type=int, default=8080, help="Bind port")
+    parser.add_argument("--db-path", default=str(DEFAULT_DB_PATH), help="Chat history database")
+    parser.add_argument(
+        "--no-persist",
+        action="store_true",
+        help="Keep chats in memory only",
+    )
+    parser.add_argument(
+        "--max-live-sessions",
+        type=int,
+        default=ChatStoreConfig().max_live_sessions,
+        help="Chats kept in memory before the least recently used are evicted",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=ChatStoreConfig().idle_timeout_s,
+        help="Seconds before an idle chat is evicted from memory (0 disables)",
+    )
+    add_server_arguments(parser)
+    add_diagnostics_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    config = AppConfig(model=ModelConfig(base_url=args.base_url, model=args.model))
+    config = AppConfig(
+        model=ModelConfig(
+            base_url=args.base_url,
+            model=args.model,
+            base_urls=tuple(args.backend),
+            profile=args.profile,
+        ),
+        chats=ChatStoreConfig(
+            db_path=None if args.no_persist else Path(args.db_path),
+            max_live_sessions=args.max_live_sessions,
+            idle_timeout_s=args.idle_timeout or None,
+        ),
+        diagnostics=diagnostics_config_from_args(args),
+    )
     app = create_app(config)
-    app.run(host=args.host, port=args.port, debug=False)
+    server_config = server_config_from_args(args)
+    try:
+        if server_config.mode == "dev":
+            app.run(host=args.host, port=args.port, debug=False)
+        else:
+            serve(args.host, args.port, app, server_config)
+    finally:
+        shutdown_app(app)
 
 
 if __name__ == "__main__":
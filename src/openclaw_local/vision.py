@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import ctypes.util
 import importlib
+import json
+import itertools
 import sys
-from dataclasses import dataclass
-from typing import Generator
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, List, Sequence
+
+from openclaw_local.metrics import VISION_STAGE_SECONDS
 
 
 @dataclass(frozen=True)
@@ -17,20 +22,222 @@ class VisionSupport:
         return self.cv2_available and self.mediapipe_available
 
 
-class VisionService:
-    def support(self) -> VisionSupport:
-        cv2_available = importlib.util.find_spec("cv2") is not None
-        mediapipe_available = importlib.util.find_spec("mediapipe") is not None
+Landmark = Sequence[float]
+
+
+@dataclass
+class LandmarkEncoder:
+    quantize: int | None = None
+    delta: bool = False
+    keyframe_interval: int = 30
+    _previous: List[List[int]] | None = field(default=None, init=False, repr=False)
+    _frames_since_key: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.delta and not self.quantize:
+            self.quantize = 1000
+
+    def _flatten(self, hand: Sequence[Landmark]) -> List[Any]:
+        values = [value for point in hand for value in point]
+        if self.quantize:
+            return [round(value * self.quantize) for value in values]
+        return [round(value, 4) for value in values]
 
-        if sys.platform.startswith("linux") and ctypes.util.find_library("GL") is None:
-            cv2_available = False
+    def encode(self, hands: Sequence[Sequence[Landmark]], timestamp_ms: int) -> Dict[str, Any]:
+        flat = [self._flatten(hand) for hand in hands]
+        frame: Dict[str, Any] = {"t": timestamp_ms}
+        if self.quantize:
+            frame["q"] = self.quantize
 
-        return VisionSupport(
-            cv2_available=cv2_available,
-            mediapipe_available=mediapipe_available,
+        previous = self._previous
+        use_delta = (
+            self.delta
+            and previous is not None
+            and len(previous) == len(flat)
+            and self._frames_since_key < self.keyframe_interval
         )
+        if use_delta:
+            frame["d"] = [
+                [value - prev for value, prev in zip(hand, prev_hand)]
+                for hand, prev_hand in zip(flat, previous)
+            ]
+            self._frames_since_key += 1
+        else:
+            frame["h"] = flat
+            self._frames_since_key = 0
+
+        if self.delta:
+            self._previous = flat
+        return frame
+
+
+@dataclass(frozen=True)
+class EncoderSettings:
+    quality: int = 80
+    max_width: int | None = None
+    target_kbps: int | None = None
+    encode_budget_ms: float = 25.0
+    send_budget_ms: float = 150.0
+
+
+class AdaptiveJpegController:
+    MIN_QUALITY = 35
+    MIN_WIDTH = 320
+    QUALITY_STEP = 10
+    WIDTH_FACTOR = 0.75
+    RECOVERY_FRAMES = 30
+    DEGRADE_COOLDOWN_FRAMES = 5
+
+    def __init__(self, settings: EncoderSettings) -> None:
+        self.settings = settings
+        self.quality = settings.quality
+        self.max_width = settings.max_width
+        self.frames = 0
+        self.bytes_total = 0
+        self.last_frame_bytes = 0
+        self.avg_frame_bytes = 0.0
+        self.avg_encode_ms = 0.0
+        self.avg_send_ms = 0.0
+        self.kbps = 0.0
+        self._calm_frames = 0
+        self._cooldown = 0
+        self._last_frame_at: float | None = None
+
+    @staticmethod
+    def _ema(current: float, sample: float, first: bool) -> float:
+        return sample if first else current * 0.9 + sample * 0.1
+
+    def target_width(self, frame_width: int) -> int:
+        if self.max_width is None or frame_width <= self.max_width:
+            return frame_width
+        return self.max_width
+
+    def record(
+        self,
+        frame_bytes: int,
+        encode_ms: float,
+        send_ms: float,
+        frame_width: int,
+        now: float | None = None,
+    ) -> None:
+        now = time.monotonic() if now is None else now
+        first = self.frames == 0
+        self.frames += 1
+        self.bytes_total += frame_bytes
+        self.last_frame_bytes = frame_bytes
+        self.avg_frame_bytes = self._ema(self.avg_frame_bytes, frame_bytes, first)
+        self.avg_encode_ms = self._ema(self.avg_encode_ms, encode_ms, first)
+        self.avg_send_ms = self._ema(self.avg_send_ms, send_ms, first)
+        if self._last_frame_at is not None and now > self._last_frame_at:
+            sample_kbps = frame_bytes * 8 / 1000 / (now - self._last_frame_at)
+            self.kbps = self._ema(self.kbps, sample_kbps, self.kbps == 0.0)
+        self._last_frame_at = now
+
+        settings = self.settings
+        over_budget = (
+            self.avg_encode_ms > settings.encode_budget_ms
+            or self.avg_send_ms > settings.send_budget_ms
+            or (settings.target_kbps is not None and self.kbps > settings.target_kbps)
+        )
+        if over_budget:
+            self._calm_frames = 0
+            if self._cooldown > 0:
+                self._cooldown -= 1
+                return
+            self._cooldown = self.DEGRADE_COOLDOWN_FRAMES
+            self._degrade(frame_width)
+            return
+
+        self._cooldown = 0
+        self._calm_frames += 1
+        if self._calm_frames >= self.RECOVERY_FRAMES:
+            self._calm_frames = 0
+            self._recover(frame_width)
+
+    def _degrade(self, frame_width: int) -> None:
+        if self.quality > self.MIN_QUALITY:
+            self.quality = max(self.MIN_QUALITY, self.quality - self.QUALITY_STEP)
+            return
+        width = self.target_width(frame_width)
+        reduced = max(self.MIN_WIDTH, int(width * self.WIDTH_FACTOR))
+        if reduced < width:
+            self.max_width = reduced
+
+    def _recover(self, frame_width: int) -> None:
+        settings = self.settings
+        if self.max_width is not None and self.max_width != settings.max_width:
+            grown = int(self.max_width / self.WIDTH_FACTOR)
+            ceiling = settings.max_width if settings.max_width is not None else frame_width
+            self.max_width = settings.max_width if grown >= ceiling else grown
+            return
+        if self.quality < settings.quality:
+            self.quality = min(settings.quality, self.quality + self.QUALITY_STEP)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "quality": self.quality,
+            "max_width": self.max_width,
+            "frames": self.frames,
+            "bytes_total": self.bytes_total,
+            "last_frame_bytes": self.last_frame_bytes,
+            "avg_frame_bytes": round(self.avg_frame_bytes, 1),
+            "avg_encode_ms": round(self.avg_encode_ms, 3),
+            "avg_send_ms": round(self.avg_send_ms, 3),
+            "kbps": round(self.kbps, 1),
+        }
+
 
-    def stream_mjpeg(self) -> Generator[bytes, None, None]:
+def _hand_points(multi_hand_landmarks: Any) -> List[List[Landmark]]:
+    if not multi_hand_landmarks:
+        return []
+    return [
+        [(point.x, point.y, point.z) for point in hand.landmark]
+        for hand in multi_hand_landmarks
+    ]
+
+
+def _probe_support() -> VisionSupport:
+    import ctypes.util
+
+    cv2_available = importlib.util.find_spec("cv2") is not None
+    mediapipe_available = importlib.util.find_spec("mediapipe") is not None
+
+    if sys.platform.startswith("linux") and ctypes.util.find_library("GL") is None:
+        cv2_available = False
+
+    return VisionSupport(
+        cv2_available=cv2_available,
+        mediapipe_available=mediapipe_available,
+    )
+
+
+class VisionService:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stream_ids = itertools.count(1)
+        self._streams: Dict[int, AdaptiveJpegController] = {}
+        self._support: VisionSupport | None = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "streams": [
+                    {"id": stream_id, **controller.snapshot()}
+                    for stream_id, controller in self._streams.items()
+                ]
+            }
+
+    def support(self) -> VisionSupport:
+        # Installed packages don't change while the app runs, and find_library shells out
+        # to ldconfig on Linux, so the probe runs once per service.
+        if self._support is None:
+            self._support = _probe_support()
+        return self._support
+
+    def stream_mjpeg(
+        self,
+        settings: EncoderSettings | None = None,
+    ) -> Generator[bytes, None, None]:
         cv2 = importlib.import_module("cv2")
         mediapipe = importlib.import_module("mediapipe")
 
@@ -47,36 +254,121 @@ class VisionService:
             yield frame
             return
 
-        with mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        ) as hands:
-            while True:
-                success, frame = cap.read()
-                if not success:
-                    break
-
-                frame = cv2.flip(frame, 1)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(rgb)
-
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_draw.draw_landmarks(
+        controller = AdaptiveJpegController(settings or EncoderSettings())
+        stream_id = next(self._stream_ids)
+        with self._lock:
+            self._streams[stream_id] = controller
+
+        try:
+            with mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=2,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            ) as hands:
+                while True:
+                    capture_started = time.perf_counter()
+                    success, frame = cap.read()
+                    if not success:
+                        break
+
+                    inference_started = time.perf_counter()
+                    frame = cv2.flip(frame, 1)
+                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    results = hands.process(rgb)
+
+                    draw_started = time.perf_counter()
+                    if results.multi_hand_landmarks:
+                        for hand_landmarks in results.multi_hand_landmarks:
+                            mp_draw.draw_landmarks(
+                                frame,
+                                hand_landmarks,
+                                mp_hands.HAND_CONNECTIONS,
+                            )
+
+                    encode_started = time.perf_counter()
+                    height, width = frame.shape[:2]
+                    target_width = controller.target_width(width)
+                    if target_width < width:
+                        target_height = max(1, int(height * target_width / width))
+                        frame = cv2.resize(
                             frame,
-                            hand_landmarks,
-                            mp_hands.HAND_CONNECTIONS,
+                            (target_width, target_height),
+                            interpolation=cv2.INTER_AREA,
                         )
+                    ok, buffer = cv2.imencode(
+                        ".jpg",
+                        frame,
+                        [int(cv2.IMWRITE_JPEG_QUALITY), controller.quality],
+                    )
+                    if not ok:
+                        continue
+                    payload = buffer.tobytes()
+                    encode_ms = (time.perf_counter() - encode_started) * 1000
+                    VISION_STAGE_SECONDS.observe(inference_started - capture_started, stage="capture")
+                    VISION_STAGE_SECONDS.observe(draw_started - inference_started, stage="inference")
+                    VISION_STAGE_SECONDS.observe(encode_started - draw_started, stage="draw")
+                    VISION_STAGE_SECONDS.observe(encode_ms / 1000, stage="encode")
+
+                    send_started = time.perf_counter()
+                    yield (
+                        b"--frame\r\n"
+                        b"Content-Type: image/jpeg\r\n\r\n" + payload + b"\r\n"
+                    )
+                    send_ms = (time.perf_counter() - send_started) * 1000
+                    VISION_STAGE_SECONDS.observe(send_ms / 1000, stage="send")
+                    controller.record(len(payload), encode_ms, send_ms, width)
+        finally:
+            with self._lock:
+                self._streams.pop(stream_id, None)
+            cap.release()
+
+    def stream_landmarks(
+        self,
+        encoder: LandmarkEncoder | None = None,
+        sse: bool = False,
+    ) -> Generator[bytes, None, None]:
+        cv2 = importlib.import_module("cv2")
+        mediapipe = importlib.import_module("mediapipe")
 
-                ok, buffer = cv2.imencode(".jpg", frame)
-                if not ok:
-                    continue
+        mp_hands = mediapipe.solutions.hands
+        encoder = encoder or LandmarkEncoder()
+
+        def emit(payload: Dict[str, Any]) -> bytes:
+            line = json.dumps(payload, separators=(",", ":"))
+            if sse:
+                return f"data: {line}\n\n".encode("utf-8")
+            return (line + "\n").encode("utf-8")
+
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            yield emit({"error": "Camera unavailable"})
+            return
 
-                yield (
-                    b"--frame\r\n"
-                    b"Content-Type: image/jpeg\r\n\r\n" + buffer.tobytes() + b"\r\n"
-                )
+        try:
+            with mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=2,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            ) as hands:
+                while True:
+                    capture_started = time.perf_counter()
+                    success, frame = cap.read()
+                    if not success:
+                        break
 
-        cap.release()
+                    timestamp_ms = int(time.time() * 1000)
+                    inference_started = time.perf_counter()
+                    frame = cv2.flip(frame, 1)
+                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    results = hands.process(rgb)
+                    VISION_STAGE_SECONDS.observe(inference_started - capture_started, stage="capture")
+                    VISION_STAGE_SECONDS.observe(
+                        time.perf_counter() - inference_started,
+                        stage="inference",
+                    )
+                    points = _hand_points(results.multi_hand_landmarks)
+                    yield emit(encoder.encode(points, timestamp_ms))
+        finally:
+            cap.release()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import LimitedStream
+
+from openclaw_local.config import ServerConfig
+
+_BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Content-Length: 12\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n\r\n"
+    b"Server busy\n"
+)
+# Unread request bodies up to this size are skipped so the connection can be reused.
+_MAX_DISCARD = 64 * 1024
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    # werkzeug's handler ends every response with Connection: close. This one keeps
+    # HTTP/1.1 connections open for the next request while the server has spare workers.
+    protocol_version = "HTTP/1.1"
+    server: "PooledWSGIServer"
+    _body: LimitedStream | None = None
+
+    def setup(self) -> None:
+        # The socket timeout doubles as the idle limit between requests on one connection.
+        self.timeout = self.server.config.keep_alive_s
+        super().setup()
+
+    def make_environ(self) -> Any:
+        environ = super().make_environ()
+        if not environ.get("wsgi.input_terminated"):
+            try:
+                length = max(0, int(environ.get("CONTENT_LENGTH") or 0))
+            except ValueError:
+                length = None
+            if length is not None:
+                self._body = environ["wsgi.input"] = LimitedStream(self.rfile, length)
+        # After the response werkzeug reads and discards whatever is left on the socket,
+        # which on a reused connection is the next request. Give it nothing to read; the
+        # unread body is skipped in run_wsgi instead.
+        self.rfile, self._socket_rfile = io.BytesIO(), self.rfile
+        return environ
+
+    def run_wsgi(self) -> None:
+        try:
+            super().run_wsgi()
+        finally:
+            self.rfile = self._socket_rfile
+        if not self.close_connection and not self._skip_unread_body():
+            self.close_connection = True
+        self._body = None
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if keyword.lower() == "connection" and self._reusable():
+            value = "keep-alive"
+        super().send_header(keyword, value)
+
+    def _reusable(self) -> bool:
+        server = self.server
+        return (
+            not self.close_connection
+            and self._body is not None
+            and not server.draining
+            and server.in_flight <= server.config.threads
+        )
+
+    def _skip_unread_body(self) -> bool:
+        body = self._body
+        if body is None or body.limit - body.tell() > _MAX_DISCARD:
+            return False
+        try:
+            body.exhaust()
+        except Exception:
+            return False
+        return body.is_exhausted
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host: str, port: int, app: Any, config: ServerConfig) -> None:
+        super().__init__(host, port, app, handler=KeepAliveRequestHandler)
+        self.config = config
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.threads,
+            thread_name_prefix="http",
+        )
+        self._slots = threading.BoundedSemaphore(config.threads + config.queue_size)
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self.rejected = 0
+        self.draining = False
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            try:
+                request.sendall(_BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        with self._idle:
+            self._in_flight += 1
+        future = self._executor.submit(self._process, request, client_address)
+        future.add_done_callback(partial(self._close_if_cancelled, request))
+
+    def _process(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._finish(request)
+
+    def _close_if_cancelled(self, request: Any, future: Future) -> None:
+        # A request still queued when drain gives up never runs, so close it here.
+        if future.cancelled():
+            self._finish(request)
+
+    def _finish(self, request: Any) -> None:
+        self.shutdown_request(request)
+        self._slots.release()
+        with self._idle:
+            self._in_flight -= 1
+            self._idle.notify_all()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        self.draining = True
+        self.shutdown()
+        self.server_close()
+        timeout = self.config.drain_timeout_s if timeout is None else timeout
+        with self._idle:
+            drained = self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return drained
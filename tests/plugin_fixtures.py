@@ -0,0 +1,19 @@
+import os
+import time
+
+
+def upper(payload: str) -> str:
+    return payload.upper()
+
+
+def pid(payload: str) -> str:
+    return str(os.getpid())
+
+
+def sleep(payload: str) -> str:
+    time.sleep(float(payload))
+    return payload
+
+
+def crash(payload: str) -> str:
+    os._exit(3)
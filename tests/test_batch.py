@@ -0,0 +1,70 @@
+import io
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+from openclaw_local.batch import completed_ids, read_prompts, run_batch
+from openclaw_local.config import AppConfig, ToolConfig
+
+
+class EchoAgent:
+    def __init__(self, config, log=None):
+        self.log = log
+        self.last_error = None
+
+    def ask(self, text: str) -> str:
+        if text == "boom":
+            raise RuntimeError("model fell over")
+        self.log.append("user", text)
+        return text[::-1]
+
+
+def test_read_prompts_formats() -> None:
+    lines = ['{"id": "a", "prompt": "hi"}', '"quoted"', "", "plain text"]
+    assert list(read_prompts(lines)) == [("a", "hi"), ("2", "quoted"), ("4", "plain text")]
+
+
+def test_run_batch_writes_results_and_resumes(tmp_path: Path) -> None:
+    prompts = [(str(n), f"prompt {n}") for n in range(20)] + [("bad", "boom")]
+    output = tmp_path / "out.jsonl"
+    with output.open("w", encoding="utf-8") as handle:
+        summary = run_batch(AppConfig(), iter(prompts), handle, concurrency=3, agent_factory=EchoAgent)
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 21
+    assert {r["id"]: r["response"] for r in records}["3"] == "3 tpmorp"
+    assert summary.completed == 20 and summary.failed == 1
+    stats = summary.to_dict()
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["max"]
+
+    done = completed_ids(output)
+    assert "bad" not in done and len(done) == 20
+    resumed = run_batch(AppConfig(), iter(prompts), io.StringIO(), skip=done, agent_factory=EchoAgent)
+    assert resumed.skipped == 20 and resumed.failed == 1
+
+
+def test_run_batch_fails_prompts_whose_tool_follow_up_failed(monkeypatch, tmp_path) -> None:
+    calls = []
+
+    def fake_post(url, data, headers, timeout, stream):
+        calls.append(url)
+        if len(calls) > 1:
+            raise requests.ConnectionError("connection refused")
+        content = json.dumps({"tool": "list_dir", "args": {}})
+        return SimpleNamespace(
+            json=lambda: {"message": {"role": "assistant", "content": content}},
+            raise_for_status=lambda: None,
+            close=lambda: None,
+        )
+
+    monkeypatch.setattr(requests, "post", fake_post)
+    config = AppConfig(tool=ToolConfig(working_directory=tmp_path))
+    output = io.StringIO()
+    summary = run_batch(config, iter([("1", "what is here?")]), output)
+
+    [record] = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert summary.failed == 1
+    assert not record["ok"]
+    assert record["error"].startswith("Tool follow-up failed")
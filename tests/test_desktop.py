@@ -0,0 +1,46 @@
+import socket
+
+import requests
+from fake_ollama import FakeOllama
+
+from openclaw_local.config import AppConfig, ModelConfig
+from openclaw_local.desktop import ServerThread, StartupTimer, warm_up
+from openclaw_local.serving import wait_until_listening
+from openclaw_local.ui import create_app, shutdown_app
+
+
+def test_server_thread_reports_ready_once_listening() -> None:
+    app = create_app(AppConfig())
+    server = ServerThread("127.0.0.1", 0, app)
+    server.start()
+    try:
+        assert server.wait_ready(5)
+        assert requests.get(f"{server.url}/api/chats", timeout=5).status_code == 200
+    finally:
+        server.shutdown()
+        shutdown_app(app)
+
+
+def test_wait_until_listening_gives_up_on_a_closed_port() -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    assert not wait_until_listening("127.0.0.1", port, timeout_s=0.1)
+
+
+def test_warm_up_loads_the_model_and_primes_the_status_cache() -> None:
+    with FakeOllama() as ollama:
+        app = create_app(AppConfig(model=ModelConfig(base_url=ollama.base_url)))
+        store = app.extensions["openclaw_store"]
+        timer = StartupTimer()
+        timer.warmup.extend(warm_up(store))
+        timer.mark("warmup_done")
+
+        assert all(result.ok for result in timer.warmup)
+        assert ollama.requests == {"tags": 1, "chat": 1}
+        assert store.status()["models"] == ["llama3", "mistral"]
+        assert ollama.requests["tags"] == 1
+        report = timer.to_dict()
+        assert [item["name"] for item in report["warmup"]] == ["ollama-status", "load-default-model"]
+        assert report["total_ms"] == report["marks_ms"]["warmup_done"]
+        shutdown_app(app)
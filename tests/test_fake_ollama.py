@@ -0,0 +1,43 @@
+import json
+
+import requests
+from fake_ollama import FakeOllama, FakeOllamaConfig
+
+from openclaw_local.agent import OpenClawAgent
+from openclaw_local.config import AppConfig, ModelConfig, ToolConfig
+from openclaw_local.ollama_client import OllamaClient
+
+
+def test_client_and_agent_against_fake_server(tmp_path) -> None:
+    with FakeOllama(FakeOllamaConfig(tokens=4)) as server:
+        client = OllamaClient(ModelConfig(base_url=server.base_url))
+        assert client.status()["models"] == ["llama3", "mistral"]
+        reply = client.chat([{"role": "user", "content": "hi"}])
+        assert reply["message"]["content"] == "token0 token1 token2 token3"
+
+        (tmp_path / "marker.txt").write_text("x", encoding="utf-8")
+        agent = OpenClawAgent(
+            AppConfig(
+                tool=ToolConfig(working_directory=tmp_path),
+                model=ModelConfig(base_url=server.base_url),
+            )
+        )
+        assert agent.ask("tool:list_dir") == "token0 token1 token2 token3"
+        tool_result = list(agent.log.context())[1]["content"]
+        assert "marker.txt" in tool_result
+        assert server.requests["chat"] == 3
+
+
+def test_fake_server_streams_ndjson() -> None:
+    with FakeOllama(FakeOllamaConfig(tokens=3)) as server:
+        response = requests.post(
+            f"{server.base_url}/api/chat",
+            json={"model": "llama3", "messages": [], "stream": True},
+            stream=True,
+            timeout=5,
+        )
+        chunks = [json.loads(line) for line in response.iter_lines() if line]
+        assert "".join(c["message"]["content"] for c in chunks) == "token0 token1 token2"
+        assert chunks[-1]["done"] is True
+        missing = requests.post(f"{server.base_url}/api/chat", json={"model": "nope"}, timeout=5)
+        assert missing.status_code == 404
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# Generous enough for a slow CI machine; pulling requests or Flask back into the CLI
+# import path costs well over this on its own.
+MAIN_BUDGET_MS = 200
+
+
+def _import_times(module: str) -> Dict[str, float]:
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    # The first run may compile bytecode; measure the second.
+    for _ in range(2):
+        completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+@pytest.mark.parametrize(
+    "module, heavy",
+    [
+        ("openclaw_local.main", {"flask", "werkzeug", "requests", "openclaw_local.agent"}),
+        ("openclaw_local.desktop", {"flask", "werkzeug", "requests", "openclaw_local.ui"}),
+        ("openclaw_local.tasks", {"asyncio", "multiprocessing"}),
+        ("openclaw_local.plugins", {"asyncio", "pickle", "hashlib"}),
+    ],
+)
+def test_entry_points_defer_heavy_imports(module: str, heavy: set) -> None:
+    assert heavy.isdisjoint(_import_times(module))
+
+
+def test_cli_import_time_budget() -> None:
+    assert _import_times("openclaw_local.main")["openclaw_local.main"] < MAIN_BUDGET_MS
@@ -0,0 +1,54 @@
+import threading
+
+from openclaw_local.jobs import CANCELLED, DONE, JobQueue
+
+
+def test_jobs_serialize_per_key_and_run_keys_in_parallel() -> None:
+    queue = JobQueue(max_workers=2)
+    gate = threading.Event()
+    order = []
+
+    first = queue.submit("a", lambda: gate.wait(5) and order.append("a1"))
+    second = queue.submit("a", lambda: order.append("a2"))
+    other = queue.submit("b", lambda: "b-done")
+
+    assert other.wait(5)
+    assert other.result == "b-done"
+    assert second.status == "queued"
+
+    gate.set()
+    assert second.wait(5)
+    assert order == ["a1", "a2"]
+    assert first.status == DONE
+    queue.shutdown()
+
+
+def test_cancel_queued_job() -> None:
+    queue = JobQueue(max_workers=1)
+    gate = threading.Event()
+    started = threading.Event()
+    running = queue.submit("a", lambda: started.set() or gate.wait(5))
+    queued = queue.submit("a", lambda: "never")
+    assert started.wait(5)
+
+    assert queue.depth() == 1
+    assert queue.cancel(queued.job_id) is True
+    assert queued.status == CANCELLED
+    assert queue.cancel(running.job_id) is False
+
+    gate.set()
+    assert running.wait(5)
+    queue.shutdown()
+
+
+def test_failed_job_records_error() -> None:
+    queue = JobQueue(max_workers=1)
+
+    def boom() -> None:
+        raise ValueError("bad turn")
+
+    job = queue.submit("a", boom)
+    assert job.wait(5)
+    assert job.status == "failed"
+    assert "bad turn" in job.error
+    queue.shutdown()
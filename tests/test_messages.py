@@ -0,0 +1,45 @@
+import json
+
+from openclaw_local.messages import CONTEXT, VISIBLE, MessageLog
+from openclaw_local.ollama_client import encode_messages
+
+
+def test_views_filter_by_flags() -> None:
+    log = MessageLog()
+    log.append("user", "open google for cats", flags=VISIBLE)
+    log.append("assistant", "Opened Google tab", flags=VISIBLE)
+    log.append("user", "hello")
+    log.append("assistant", '{"tool": "list_dir", "result": "a.txt"}', flags=CONTEXT)
+    log.append("assistant", "Found a.txt")
+
+    assert [m["content"] for m in log.visible()] == [
+        "open google for cats",
+        "Opened Google tab",
+        "hello",
+        "Found a.txt",
+    ]
+    assert [m["content"] for m in log.context("sys")] == [
+        "sys",
+        "hello",
+        '{"tool": "list_dir", "result": "a.txt"}',
+        "Found a.txt",
+    ]
+
+    log.reset_context()
+    assert list(log.context()) == []
+
+
+def test_context_view_encodes_like_json() -> None:
+    log = MessageLog()
+    log.append("user", 'quote " and \\n newline')
+    log.append("assistant", "ünïcode")
+    view = log.context("system prompt")
+    assert json.loads(encode_messages(view)) == list(view)
+
+
+def test_listener_sees_every_append() -> None:
+    seen = []
+    log = MessageLog([("user", "restored", VISIBLE | CONTEXT)])
+    log.listener = lambda seq, role, content, flags: seen.append((seq, role, content, flags))
+    log.append("assistant", "new", flags=VISIBLE)
+    assert seen == [(1, "assistant", "new", VISIBLE)]
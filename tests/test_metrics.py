@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+import openclaw_local.ui as ui
+from openclaw_local.config import AppConfig, ChatStoreConfig
+from openclaw_local.metrics import HTTP_REQUEST_SECONDS, REGISTRY, MetricsRegistry
+
+
+def test_histogram_merges_thread_shards() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+
+    def work() -> None:
+        for _ in range(100):
+            histogram.observe(0.05, stage="a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    histogram.observe(5.0, stage="a")
+
+    assert histogram.count(stage="a") == 401
+    text = registry.render()
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 400' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 401' in text
+    assert "# TYPE demo_seconds histogram" in text
+
+
+def test_counter_and_gauge_render() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo.", ("kind",))
+    counter.inc(kind="x")
+    counter.inc(2, kind="x")
+    registry.gauge("demo_depth", "Depth.").set_function(lambda: 7)
+
+    assert counter.value(kind="x") == 3
+    text = registry.render()
+    assert 'demo_total{kind="x"} 3' in text
+    assert "demo_depth 7" in text
+
+
+def test_metrics_endpoint_records_routes() -> None:
+    app = ui.create_app(AppConfig())
+    client = app.test_client()
+    client.get("/api/chats")
+
+    body = client.get("/api/metrics").get_data(as_text=True)
+    assert 'route="/api/chats"' in body
+    assert "openclaw_job_queue_depth 0" in body
+    ui.shutdown_app(app)
+
+
+def test_requests_that_raise_are_still_measured() -> None:
+    app = ui.create_app(AppConfig())
+    app.testing = True
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/boom")
+    assert HTTP_REQUEST_SECONDS.count(route="/boom", method="GET", status=500) == 1
+    ui.shutdown_app(app)
+
+
+def _gauge_value(name: str) -> float:
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(f"{name} "):
+            return float(line.split()[1])
+    raise AssertionError(f"{name} not rendered")
+
+
+def test_gauges_follow_every_live_app(tmp_path) -> None:
+    first = ui.create_app(AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "first.db")))
+    before = _gauge_value("openclaw_live_sessions")
+    second = ui.create_app(AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "second.db")))
+    second.extensions["openclaw_store"].create_chat("Extra", "llama3")
+    assert _gauge_value("openclaw_live_sessions") == before + 2
+
+    ui.shutdown_app(second)
+    assert _gauge_value("openclaw_live_sessions") == before
+    ui.shutdown_app(first)
+
+
+def test_finished_threads_do_not_keep_their_shards() -> None:
+    counter = MetricsRegistry().counter("demo_total", "Demo.")
+    for _ in range(50):
+        thread = threading.Thread(target=counter.inc)
+        thread.start()
+        thread.join()
+
+    assert len(counter._shards) <= 1
+    assert counter.value() == 50
@@ -1,5 +1,6 @@
 from types import SimpleNamespace
 
+import pytest
 import requests
 
 from openclaw_local.config import ModelConfig
@@ -31,3 +32,19 @@ def test_status_error(monkeypatch) -> None:
     assert status["ok"] is False
     assert status["models"] == []
     assert "boom" in status["error"]
+
+
+def test_chat_closes_the_streamed_response_when_it_fails(monkeypatch) -> None:
+    closed = []
+
+    def bad_status():
+        raise requests.HTTPError("500 Server Error")
+
+    def fake_post(url, data, headers, timeout, stream):
+        return SimpleNamespace(raise_for_status=bad_status, close=lambda: closed.append(url))
+
+    monkeypatch.setattr(requests, "post", fake_post)
+    client = OllamaClient(ModelConfig())
+    with pytest.raises(requests.HTTPError):
+        client.chat([{"role": "user", "content": "hi"}])
+    assert closed == ["http://localhost:11434/api/chat"]
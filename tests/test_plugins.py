@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from openclaw_local import plugins
+from openclaw_local.plugin_workers import PluginCrashed, PluginTimeout, PluginWorkerPool
+from openclaw_local.plugins import Plugin, PluginRegistry
+
+
+def _install_fake_plugin(root: Path) -> None:
+    (root / "fake_plugin_pkg.py").write_text(
+        "def shout(payload):\n    return payload.upper()\n", encoding="utf-8"
+    )
+    dist = root / "fake_plugin_pkg-1.0.dist-info"
+    dist.mkdir()
+    (dist / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: fake-plugin-pkg\nVersion: 1.0\nSummary: Shouts back\n",
+        encoding="utf-8",
+    )
+    (dist / "entry_points.txt").write_text(
+        "[openclaw_local.plugins]\nshout = fake_plugin_pkg:shout\n", encoding="utf-8"
+    )
+
+
+def test_discover_is_lazy_and_cached(monkeypatch, tmp_path: Path) -> None:
+    site = tmp_path / "site"
+    site.mkdir()
+    _install_fake_plugin(site)
+    monkeypatch.syspath_prepend(str(site))
+    manifest = tmp_path / "plugins.json"
+
+    registry = PluginRegistry()
+    assert registry.discover(manifest) == 1
+    [plugin] = registry.list()
+    assert (plugin.name, plugin.description) == ("shout", "Shouts back")
+    assert "fake_plugin_pkg" not in sys.modules
+    assert registry.run("shout", "hi") == "HI"
+    assert "fake_plugin_pkg" in sys.modules
+    monkeypatch.delitem(sys.modules, "fake_plugin_pkg")
+
+    def no_scan(group):
+        raise AssertionError("manifest should have been reused")
+
+    monkeypatch.setattr(plugins, "_scan_entry_points", no_scan)
+    cached = PluginRegistry()
+    assert cached.discover(manifest) == 1
+    assert [p.name for p in cached.list()] == ["shout"]
+
+
+def test_manifest_fingerprint_only_tracks_distribution_metadata(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    before = plugins._path_fingerprint()
+    (tmp_path / "notes.py").write_text("x = 1\n", encoding="utf-8")
+    assert plugins._path_fingerprint() == before
+
+    _install_fake_plugin(tmp_path)
+    assert plugins._path_fingerprint() != before
+
+
+def test_unknown_plugin() -> None:
+    with pytest.raises(KeyError):
+        PluginRegistry().run("missing", "x")
+
+
+def test_isolated_plugins_run_in_worker_processes() -> None:
+    pool = PluginWorkerPool(size=1, timeout_s=10, preload=["plugin_fixtures:upper"])
+    registry = PluginRegistry(workers=pool)
+    for name in ("upper", "pid", "sleep", "crash"):
+        registry.register(
+            Plugin(name, name, target=f"plugin_fixtures:{name}", isolated=True, timeout_s=5)
+        )
+    registry.register(
+        Plugin("slow", "slow", target="plugin_fixtures:sleep", isolated=True, timeout_s=0.2)
+    )
+
+    assert registry.run("upper", "hi") == "HI"
+    worker_pid = registry.run("pid", "")
+    assert worker_pid != str(os.getpid())
+
+    with pytest.raises(PluginCrashed):
+        registry.run("crash", "")
+    with pytest.raises(PluginTimeout):
+        registry.run("slow", "5")
+    assert pool.stats()["respawns"] == 2
+    assert registry.run("upper", "back") == "BACK"
+    assert registry.run("pid", "") != worker_pid
+
+    pool.resize(2)
+    assert pool.stats()["workers"] == 2
+    registry.close()
+
+
+def test_unpicklable_handlers_never_leak_workers() -> None:
+    with pytest.raises(ValueError, match="module-level"):
+        PluginRegistry().register(Plugin("local", "local", lambda p: p, isolated=True))
+
+    pool = PluginWorkerPool(size=1, timeout_s=2)
+    with pytest.raises(Exception):
+        pool.call(lambda payload: payload, "x")
+    assert pool.stats()["idle"] == 1
+    assert pool.call("plugin_fixtures:upper", "ok") == "OK"
+    pool.close()
+
+
+def test_async_and_streaming_handlers() -> None:
+    async def fetch(payload: str) -> str:
+        await asyncio.sleep(0.01)
+        return f"fetched {payload}"
+
+    async def words(payload: str):
+        for word in payload.split():
+            await asyncio.sleep(0)
+            yield word
+
+    async def stuck(payload: str) -> str:
+        await asyncio.sleep(5)
+        return payload
+
+    def lines(payload: str):
+        yield from payload.splitlines(keepends=True)
+
+    registry = PluginRegistry(max_async=2)
+    registry.register(Plugin("fetch", "Fetch", fetch))
+    registry.register(Plugin("words", "Words", words))
+    registry.register(Plugin("stuck", "Stuck", stuck, timeout_s=0.05))
+    registry.register(Plugin("lines", "Lines", lines))
+    registry.register(Plugin("echo", "Echo", lambda payload: payload))
+
+    assert registry.run("fetch", "x") == "fetched x"
+    assert list(registry.stream("words", "a b c")) == ["a", "b", "c"]
+    assert registry.run("words", "a b") == "ab"
+    assert list(registry.stream("lines", "1\n2\n")) == ["1\n", "2\n"]
+    assert list(registry.stream("echo", "hi")) == ["hi"]
+    with pytest.raises(PluginTimeout):
+        registry.run("stuck", "x")
+
+    stream = registry.stream("words", "one two three")
+    assert next(stream) == "one"
+    stream.close()
+    assert registry.run("fetch", "again") == "fetched again"
+    registry.close()
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+import openclaw_local.ui as ui
+from openclaw_local.agent import OpenClawAgent
+from openclaw_local.config import AppConfig, ChatStoreConfig, ModelConfig, ToolConfig
+
+
+class RecordingAgent:
+    def __init__(self, config, log=None, affinity=None):
+        self.profile = config.model.profile
+        self.log = log
+
+    def ask(self, text: str) -> str:
+        self.log.append("user", text)
+        self.log.append("assistant", self.profile)
+        return self.profile
+
+
+def test_agent_sends_profile_options_and_tightens_tool_follow_ups(monkeypatch, tmp_path) -> None:
+    bodies = []
+    replies = iter([json.dumps({"tool": "list_dir", "args": {}}), "done"])
+
+    def fake_post(url, data, headers, timeout, stream):
+        bodies.append(json.loads(data))
+        content = next(replies)
+        return SimpleNamespace(
+            json=lambda: {"message": {"role": "assistant", "content": content}},
+            raise_for_status=lambda: None,
+            close=lambda: None,
+        )
+
+    monkeypatch.setattr(requests, "post", fake_post)
+    config = AppConfig(
+        tool=ToolConfig(working_directory=tmp_path),
+        model=ModelConfig(profile="thorough"),
+    )
+    assert OpenClawAgent(config).ask("what is here?") == "done"
+
+    first, follow_up = (body["options"] for body in bodies)
+    assert first == {"num_ctx": 8192, "num_predict": 4096, "temperature": 0.8}
+    assert follow_up["num_ctx"] == 8192
+    assert follow_up["num_predict"] == 256
+    assert follow_up["temperature"] == 0.3
+
+
+def test_chat_profile_api_and_persistence(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", RecordingAgent)
+    config = AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "chats.db"))
+    app = ui.create_app(config)
+    client = app.test_client()
+
+    names = [profile["name"] for profile in client.get("/api/profiles").get_json()["profiles"]]
+    assert names == ["fast", "balanced", "thorough"]
+    created = client.post("/api/chats", json={"title": "Quick", "profile": "fast"}).get_json()
+    assert created["profile"] == "fast"
+    assert client.post("/api/chats", json={"profile": "turbo"}).status_code == 400
+
+    chat_id = created["id"]
+    reply = client.post(f"/api/chats/{chat_id}/messages", json={"message": "hi", "wait": True})
+    assert reply.get_json()["reply"] == "fast"
+    switched = client.post(f"/api/chats/{chat_id}/profile", json={"profile": "thorough"})
+    assert switched.get_json() == {"ok": True, "profile": "thorough"}
+    assert client.post(f"/api/chats/{chat_id}/profile", json={"profile": "x"}).status_code == 400
+    reply = client.post(f"/api/chats/{chat_id}/messages", json={"message": "hi", "wait": True})
+    assert reply.get_json()["reply"] == "thorough"
+    ui.shutdown_app(app)
+
+    restored = ui.ChatStore(config)
+    assert restored.get_chat(chat_id).profile == "thorough"
+    assert len(restored.log(restored.get_chat(chat_id))) == 4
+    restored.close()
@@ -0,0 +1,79 @@
+import pytest
+import requests
+from fake_ollama import FakeOllama, FakeOllamaConfig
+
+from openclaw_local.config import ModelConfig
+from openclaw_local.ollama_client import OllamaClient
+from openclaw_local.router import OllamaRouter, router_for
+
+HELLO = [{"role": "user", "content": "hi"}]
+
+
+def test_router_prefers_backends_with_the_model_and_sticks_per_chat() -> None:
+    with FakeOllama(FakeOllamaConfig(models=("llama3",))) as first, FakeOllama(
+        FakeOllamaConfig(models=("llama3", "mistral"))
+    ) as second:
+        router = OllamaRouter([first.base_url, second.base_url])
+        router.refresh()
+        assert router.models() == ["llama3", "mistral"]
+
+        assert router.acquire("mistral", "chat-a") == second.base_url
+        router.release(second.base_url)
+
+        # The least-loaded node wins for a new chat; an existing chat stays put.
+        busy = router.acquire("llama3", "chat-b")
+        other = router.acquire("llama3", "chat-c")
+        assert {busy, other} == {first.base_url, second.base_url}
+        router.release(busy)
+        router.release(other)
+        assert router.acquire("llama3", "chat-b") == busy
+
+
+def test_router_marks_unreachable_backends_unhealthy() -> None:
+    with FakeOllama() as live:
+        router = OllamaRouter([live.base_url, "http://127.0.0.1:9"], check_timeout_s=0.5)
+        router.refresh()
+        stats = {backend["url"]: backend for backend in router.stats()}
+        assert stats[live.base_url]["healthy"]
+        assert not stats["http://127.0.0.1:9"]["healthy"]
+        assert router.acquire("llama3", "chat") == live.base_url
+
+        router.release(live.base_url, failed=True)
+        with pytest.raises(requests.ConnectionError):
+            router.acquire("llama3", "chat")
+
+
+def test_client_fails_over_when_its_backend_goes_down() -> None:
+    servers = [FakeOllama(FakeOllamaConfig(tokens=2)).start() for _ in range(2)]
+    try:
+        config = ModelConfig(base_url=servers[0].base_url, base_urls=(servers[1].base_url,))
+        client = OllamaClient(config, affinity="chat-1")
+        assert client.chat(HELLO)["message"]["content"] == "token0 token1"
+        sticky = next(server for server in servers if server.requests.get("chat"))
+        survivor = next(server for server in servers if server is not sticky)
+
+        sticky.stop()
+        assert client.chat(HELLO)["message"]["content"] == "token0 token1"
+        assert survivor.requests["chat"] == 1
+        status = client.status()
+        assert status["ok"]
+        assert [backend["healthy"] for backend in status["backends"]].count(True) == 1
+    finally:
+        for server in servers:
+            server.stop()
+
+
+def test_status_reads_router_state_without_probing_backends(monkeypatch) -> None:
+    with FakeOllama(FakeOllamaConfig(models=("llama3",))) as live:
+        config = ModelConfig(base_url=live.base_url, base_urls=("http://127.0.0.1:9",))
+        client = OllamaClient(config)
+        router_for(config.backends).refresh()
+
+        def probe(*args, **kwargs):
+            raise AssertionError("status must not probe backends")
+
+        monkeypatch.setattr(requests, "get", probe)
+        status = client.status()
+        assert status["ok"]
+        assert status["models"] == ["llama3"]
+        assert [backend["healthy"] for backend in status["backends"]] == [True, False]
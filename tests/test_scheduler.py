@@ -0,0 +1,77 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from openclaw_local.scheduler import Cron, Interval, Scheduler
+from openclaw_local.tasks import Task
+
+
+def test_cron_next_after() -> None:
+    start = datetime(2026, 10, 19, 10, 7).timestamp()
+    assert datetime.fromtimestamp(Cron("*/15 * * * *").next_after(start)) == datetime(
+        2026, 10, 19, 10, 15
+    )
+    assert datetime.fromtimestamp(Cron("30 9 * * 1").next_after(start)) == datetime(
+        2026, 10, 26, 9, 30
+    )
+    assert datetime.fromtimestamp(Cron("0 0 1 1 *").next_after(start)) == datetime(2027, 1, 1)
+    with pytest.raises(ValueError):
+        Cron("61 * * * *")
+
+
+def test_interval_runs_and_concurrency_cap() -> None:
+    scheduler = Scheduler()
+    ticks = []
+    gate = threading.Event()
+    scheduler.add(Task("tick", lambda: ticks.append(1) or "ok"), Interval(0.02), run_now=True)
+    blocked = scheduler.add(Task("blocked", lambda: gate.wait(5) and "ok"), Interval(0.02), run_now=True)
+    scheduler.start()
+    time.sleep(0.2)
+    gate.set()
+    scheduler.stop()
+
+    assert len(ticks) >= 3
+    assert blocked.runs == 1
+    assert blocked.skipped >= 1
+    assert blocked.last_result is not None and blocked.last_result.ok
+
+
+def test_missed_runs_are_coalesced() -> None:
+    scheduler = Scheduler()
+    entry = scheduler.add(Task("late", lambda: "ok"), Interval(0.01))
+    entry.base_run = entry.next_run = time.monotonic() - 1
+    scheduler._fire(entry)
+    assert entry.runs == 1
+    assert entry.missed >= 90
+    assert entry.next_run > time.monotonic() - 0.01
+    scheduler.stop()
+
+
+def test_firings_run_on_the_scheduled_pool() -> None:
+    scheduler = Scheduler(max_workers=2)
+    workers = set()
+    scheduler.add(
+        Task("where", lambda: workers.add(threading.current_thread().name) or "ok"),
+        Interval(0.01),
+        run_now=True,
+    )
+    scheduler.start()
+    time.sleep(0.2)
+    scheduler.stop()
+
+    assert workers
+    assert all(name.startswith("scheduled") for name in workers)
+    assert len(workers) <= 2
+
+
+def test_interval_deadlines_ignore_wall_clock_jumps(monkeypatch) -> None:
+    scheduler = Scheduler()
+    entry = scheduler.add(Task("tick", lambda: "ok"), Interval(60))
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 3600)
+    assert entry.next_run - time.monotonic() > 59
+    scheduler._fire(entry)
+    assert entry.missed == 0
+    scheduler.stop()
@@ -0,0 +1,112 @@
+import http.client
+import threading
+import time
+
+import requests
+from flask import Flask
+
+from openclaw_local.config import ServerConfig
+from openclaw_local.wsgi_pool import PooledWSGIServer
+
+
+def _app(gate: threading.Event) -> Flask:
+    app = Flask(__name__)
+
+    @app.get("/slow")
+    def slow() -> str:
+        gate.wait(5)
+        return "slow"
+
+    @app.get("/fast")
+    def fast() -> str:
+        return "fast"
+
+    return app
+
+
+def test_pooled_server_serves_while_a_request_is_busy() -> None:
+    gate = threading.Event()
+    server = PooledWSGIServer("127.0.0.1", 0, _app(gate), ServerConfig(threads=4, queue_size=0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.port}"
+
+    slow = threading.Thread(target=requests.get, args=(f"{base}/slow",), kwargs={"timeout": 5})
+    slow.start()
+    time.sleep(0.1)
+    assert requests.get(f"{base}/fast", timeout=2).text == "fast"
+
+    gate.set()
+    slow.join(5)
+    assert server.drain(timeout=5) is True
+
+
+def test_pooled_server_rejects_when_queue_is_full() -> None:
+    gate = threading.Event()
+    server = PooledWSGIServer("127.0.0.1", 0, _app(gate), ServerConfig(threads=1, queue_size=0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.port}"
+
+    slow = threading.Thread(target=requests.get, args=(f"{base}/slow",), kwargs={"timeout": 5})
+    slow.start()
+    time.sleep(0.1)
+    busy = requests.get(f"{base}/fast", timeout=2)
+    assert busy.status_code == 503
+    assert server.rejected == 1
+
+    gate.set()
+    slow.join(5)
+    server.drain(timeout=5)
+
+
+def test_pooled_server_reuses_http11_connections() -> None:
+    app = _app(threading.Event())
+
+    @app.post("/ignore")
+    def ignore() -> str:
+        return "ignored"
+
+    server = PooledWSGIServer("127.0.0.1", 0, app, ServerConfig(threads=2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    try:
+        # The handler never reads this body; it must be skipped, not parsed as a request.
+        connection.request("POST", "/ignore", body=b"x" * 1000)
+        first = connection.getresponse()
+        assert first.read() == b"ignored"
+        assert first.getheader("Connection") == "keep-alive"
+        sock = connection.sock
+
+        connection.request("GET", "/fast")
+        second = connection.getresponse()
+        assert second.read() == b"fast"
+        assert connection.sock is sock
+    finally:
+        connection.close()
+        server.drain(timeout=5)
+
+
+def test_drain_closes_requests_still_waiting_for_a_worker() -> None:
+    gate = threading.Event()
+    server = PooledWSGIServer("127.0.0.1", 0, _app(gate), ServerConfig(threads=1, queue_size=2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.port}"
+
+    def get(path: str) -> None:
+        try:
+            requests.get(f"{base}{path}", timeout=5)
+        except requests.RequestException:
+            pass
+
+    clients = [threading.Thread(target=get, args=(path,)) for path in ("/slow", "/fast")]
+    for client in clients:
+        client.start()
+        time.sleep(0.1)
+    assert server.in_flight == 2
+
+    assert server.drain(timeout=0.2) is False
+    assert server.in_flight == 1
+    gate.set()
+    for client in clients:
+        client.join(5)
+    assert server.in_flight == 0
+    assert all(server._slots.acquire(blocking=False) for _ in range(3))
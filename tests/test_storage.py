@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import openclaw_local.ui as ui
+from openclaw_local.config import AppConfig, ChatStoreConfig
+from openclaw_local.messages import CONTEXT
+from openclaw_local.metrics import STORAGE_WRITE_ERRORS
+from openclaw_local.storage import ChatStorage
+
+
+class FakeAgent:
+    def __init__(self, config, log=None, affinity=None):
+        self.model = config.model.model
+        self.log = log
+
+    def ask(self, text: str) -> str:
+        reply = f"[{self.model}] {text}"
+        self.log.append("user", text)
+        self.log.append("assistant", reply)
+        return reply
+
+
+def test_storage_batches_and_pages(tmp_path: Path) -> None:
+    storage = ChatStorage(tmp_path / "chats.db")
+    storage.save_chat("c1", "First", "llama3")
+    for seq in range(5):
+        storage.append_message("c1", seq, "user", f"m{seq}")
+    storage.flush()
+
+    [record] = storage.load_chats()
+    assert record.chat_id == "c1"
+    assert record.message_count == 5
+    assert [m["content"] for m in storage.load_messages("c1", 2, 4)] == ["m2", "m3"]
+    storage.close()
+
+
+def test_chat_store_restores_lazily(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    config = AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "chats.db"))
+
+    store = ui.ChatStore(config)
+    session = store.create_chat(title="Saved", model="mistral")
+    store.append_message(session, "user", "hello")
+    store.append_message(session, "assistant", '{"tool": "list_dir"}', flags=CONTEXT)
+    store.append_message(session, "assistant", "hi there")
+    store.close()
+
+    restored = ui.ChatStore(config)
+    chats = {c["title"]: c["id"] for c in restored.list_chats()}
+    assert set(chats) == {"New Chat", "Saved"}
+
+    session = restored.get_chat(chats["Saved"])
+    assert session is not None
+    assert session.log is None
+    start, stop, page = restored.page_messages(session, limit=1)
+    assert (start, stop) == (2, 3)
+    assert page == [{"role": "assistant", "content": "hi there"}]
+    assert session.log is None
+
+    assert len(restored.messages(session)) == 2
+    assert len(restored.log(session)) == 3
+    restored.close()
+
+
+def test_page_limit_counts_only_visible_messages(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    config = AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "chats.db"))
+    store = ui.ChatStore(config)
+    session = store.create_chat(title="Tools", model="llama3")
+    store.append_message(session, "user", "first")
+    for _ in range(3):
+        store.append_message(session, "assistant", '{"tool": "list_dir"}', flags=CONTEXT)
+    store.append_message(session, "assistant", "second")
+
+    live = store.page_messages(session, limit=2)
+    store.close()
+    restored = ui.ChatStore(config)
+    stored = restored.page_messages(restored.get_chat(session.chat_id), limit=2)
+    for start, stop, page in (live, stored):
+        assert [m["content"] for m in page] == ["first", "second"]
+        assert (start, stop) == (0, 5)
+    start, _, page = restored.page_messages(restored.get_chat(session.chat_id), limit=1)
+    assert start == 4 and [m["content"] for m in page] == ["second"]
+    restored.close()
+
+
+def test_chat_store_evicts_lru_sessions_and_rebuilds(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    config = AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "chats.db", max_live_sessions=2))
+    store = ui.ChatStore(config)
+
+    first = store.create_chat(title="one", model="llama3")
+    store.run_turn(first, "hello")
+    assert first.agent is not None
+
+    for title in ("two", "three"):
+        store.run_turn(store.create_chat(title=title, model="llama3"), "hi")
+
+    assert first.agent is None
+    assert first.log is None
+    stats = store.stats()
+    assert stats["evictions"] >= 1
+    assert stats["live"] <= 2
+
+    agent = store.agent_for(first)
+    assert agent.log is first.log
+    assert agent.log.visible() == [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "[llama3] hello"},
+    ]
+    assert store.stats()["rebuilds"] == 1
+    store.close()
+
+
+def test_storage_full_text_search(tmp_path: Path) -> None:
+    storage = ChatStorage(tmp_path / "chats.db")
+    storage.append_message("c1", 0, "user", "how do I open notepad")
+    storage.append_message("c1", 1, "tool", "notepad opened", flags=CONTEXT)
+    storage.append_message("c2", 0, "assistant", "Notepad is a text editor for notes")
+    storage.close()
+
+    reopened = ChatStorage(tmp_path / "chats.db")
+    hits = reopened.search("notepad")
+    assert {(hit.chat_id, hit.seq) for hit in hits} == {("c1", 0), ("c2", 0)}
+    assert "[notepad]" in hits[0].snippet.lower()
+    assert [hit.seq for hit in reopened.search("text edi")] == [0]
+    assert reopened.search('"') == []
+    assert len(reopened.search("notepad", limit=1, offset=1)) == 1
+    reopened.close()
+
+
+def test_search_endpoint_in_memory(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig())
+    client = app.test_client()
+    chat_id = client.get("/api/chats").get_json()["chats"][0]["id"]
+    for text in ("weather in paris", "weather in rome", "open calculator"):
+        client.post(f"/api/chats/{chat_id}/messages", json={"message": text, "wait": True})
+
+    page = client.get("/api/search?q=weather&limit=3").get_json()
+    assert len(page["results"]) == 3
+    assert page["next_offset"] == 3
+    assert page["results"][0]["title"] == "New Chat"
+    rest = client.get("/api/search?q=weather&limit=3&offset=3").get_json()
+    assert len(rest["results"]) == 1 and rest["next_offset"] is None
+    assert client.get("/api/search?q=").get_json()["results"] == []
+    ui.shutdown_app(app)
+
+
+def test_failed_writes_are_logged_and_counted(tmp_path: Path, caplog) -> None:
+    storage = ChatStorage(tmp_path / "chats.db")
+    dropped = STORAGE_WRITE_ERRORS.value(outcome="dropped")
+    storage.save_chat("c1", "First", "llama3")
+    storage.append_message("c1", 0, "user", "kept")
+    storage.append_message("c1", 0, "user", "duplicate seq")
+    storage.flush("c1")
+
+    assert [m["content"] for m in storage.load_messages("c1")] == ["kept"]
+    assert STORAGE_WRITE_ERRORS.value(outcome="dropped") == dropped + 1
+    assert "dropped a write" in caplog.text
+    storage.close()
+
+
+def test_etags_do_not_survive_a_restart(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    config = AppConfig(chats=ChatStoreConfig(db_path=tmp_path / "chats.db"))
+    first = ui.create_app(config)
+    etag = first.test_client().get("/api/chats").headers["ETag"]
+    ui.shutdown_app(first)
+
+    second = ui.create_app(config)
+    response = second.test_client().get("/api/chats", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    ui.shutdown_app(second)
@@ -0,0 +1,135 @@
+import asyncio
+import operator
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from openclaw_local.tasks import SKIPPED, TIMED_OUT, Task, TaskRunner
+
+
+def test_independent_branches_run_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def branch(name: str) -> str:
+        barrier.wait()
+        order.append(name)
+        return name
+
+    runner = TaskRunner(max_workers=2)
+    runner.add(Task("a", partial(branch, "a")))
+    runner.add(Task("b", partial(branch, "b")))
+    runner.add(Task("join", lambda: order.append("join") or "joined", depends_on=("a", "b")))
+
+    results = runner.run_all()
+    assert [r.name for r in results] == ["a", "b", "join"]
+    assert all(r.ok for r in results)
+    assert order[-1] == "join"
+
+
+def test_retries_timeouts_and_skipped_dependents() -> None:
+    calls = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("boom")
+        return "ok"
+
+    runner = TaskRunner(max_workers=3)
+    runner.add(Task("flaky", flaky, retries=2))
+    runner.add(Task("slow", lambda: time.sleep(1) or "late", timeout_s=0.05))
+    runner.add(Task("after", lambda: "never", depends_on=("slow",)))
+    flaky_result, slow, after = runner.run_all()
+
+    assert flaky_result.output == "ok" and flaky_result.attempts == 3
+    assert slow.status == TIMED_OUT and slow.duration_ms < 1000
+    assert after.status == SKIPPED and after.attempts == 0
+
+
+def test_timeout_clock_starts_when_a_worker_picks_the_task_up() -> None:
+    runner = TaskRunner(
+        [Task(f"t{n}", lambda: time.sleep(0.2) or "ok", timeout_s=0.5) for n in range(6)],
+        max_workers=2,
+    )
+    assert all(result.ok for result in runner.run_all())
+
+
+def test_process_backend_timeout_terminates_the_worker() -> None:
+    runner = TaskRunner(
+        [Task("stuck", partial(time.sleep, 30), timeout_s=0.2)],
+        max_workers=1,
+        backend="process",
+    )
+    started = time.perf_counter()
+    [result] = runner.run_all()
+    assert result.status == TIMED_OUT
+    assert time.perf_counter() - started < 10
+
+
+def _hang_first_time(marker: Path) -> str:
+    if not marker.exists():
+        marker.touch()
+        time.sleep(30)
+    return "second attempt ran"
+
+
+def test_process_backend_retries_a_hung_task_on_a_fresh_worker(tmp_path: Path) -> None:
+    task = Task("hangs-once", partial(_hang_first_time, tmp_path / "tried"), timeout_s=1, retries=1)
+    runner = TaskRunner([task], max_workers=1, backend="process")
+    [result] = runner.run_all()
+    assert result.ok
+    assert result.output == "second attempt ran"
+    assert result.attempts == 2
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    runner = TaskRunner([Task("a", str, depends_on=("b",)), Task("b", str, depends_on=("a",))])
+    with pytest.raises(ValueError, match="cycle"):
+        runner.run_all()
+    with pytest.raises(ValueError, match="unknown"):
+        TaskRunner([Task("a", str, depends_on=("zzz",))]).run_all()
+
+
+def test_process_backend() -> None:
+    runner = TaskRunner([Task("add", partial(operator.add, "x", "y"))], backend="process")
+    assert runner.run_all()[0].output == "xy"
+
+
+def test_cancel_marks_unfinished_tasks() -> None:
+    started = threading.Event()
+    runner = TaskRunner(max_workers=1)
+    runner.add(Task("first", lambda: started.set() or time.sleep(0.3) or "done"))
+    runner.add(Task("second", lambda: "never", depends_on=("first",)))
+    threading.Thread(target=lambda: started.wait(5) and runner.cancel()).start()
+
+    results = runner.run_all()
+    assert [r.status for r in results] == ["cancelled", "cancelled"]
+
+
+def test_iter_results_streams_in_completion_order() -> None:
+    release = threading.Event()
+    runner = TaskRunner(max_workers=4)
+    runner.add(Task("slow", lambda: release.wait(5) and "slow"))
+    runner.add(Task("fast", lambda: "fast"))
+    runner.add(Task("tail", lambda: "tail", depends_on=("fast",)))
+
+    stream = runner.iter_results(max_in_flight=2)
+    first = next(stream)
+    assert first.name == "fast"
+    assert runner.progress()["finished"] == 1
+    release.set()
+    assert sorted(r.name for r in stream) == ["slow", "tail"]
+    assert runner.progress() == {"total": 3, "running": 0, "finished": 3, "done": 3}
+
+
+def test_aiter_results() -> None:
+    runner = TaskRunner([Task(str(n), partial(str, n)) for n in range(5)], max_workers=2)
+
+    async def collect() -> list:
+        return [result.output async for result in runner.aiter_results(max_in_flight=1)]
+
+    assert sorted(asyncio.run(collect())) == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,94 @@
+import openclaw_local.ui as ui
+from openclaw_local.config import AppConfig, DiagnosticsConfig, ModelConfig
+from openclaw_local.jobs import JobQueue
+from openclaw_local.tracing import Profiler, Tracer
+
+
+class FakeAgent:
+    def __init__(self, config, log=None, affinity=None):
+        self.log = log
+
+    def ask(self, text: str) -> str:
+        self.log.append("user", text)
+        self.log.append("assistant", text.upper())
+        return text.upper()
+
+
+def test_spans_nest_across_job_threads() -> None:
+    tracer = Tracer()
+    tracer.configure(True)
+    queue = JobQueue(max_workers=1)
+
+    def work() -> str:
+        with tracer.span("inner", step=1):
+            return tracer.current_trace_id()
+
+    with tracer.trace("outer", trace_id="abc12345") as root:
+        job = queue.submit("k", work)
+        assert job.wait(5)
+    queue.shutdown()
+
+    assert job.result == "abc12345"
+    (trace,) = tracer.recent()
+    assert [span["name"] for span in trace["spans"]] == ["outer", "inner"]
+    assert trace["spans"][1]["parent_id"] == root.span_id
+    assert trace["spans"][1]["thread"].startswith("job")
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    tracer = Tracer()
+    with tracer.trace("outer"), tracer.span("inner") as span:
+        assert span is None
+    assert tracer.recent() == []
+    assert tracer.current_trace_id() is None
+
+
+def test_profiler_samples_every_nth_call(tmp_path) -> None:
+    profiler = Profiler(every=2, directory=tmp_path)
+    for _ in range(4):
+        with profiler.sample("GET /api/chats"):
+            sum(range(1000))
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+
+def test_traces_endpoint_links_turn_to_request(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(
+        AppConfig(model=ModelConfig(model="llama3"), diagnostics=DiagnosticsConfig(trace=True))
+    )
+    client = app.test_client()
+    chat_id = client.get("/api/chats").get_json()["chats"][0]["id"]
+
+    resp = client.post(
+        f"/api/chats/{chat_id}/messages",
+        json={"message": "hi", "wait": True},
+        headers={"X-Trace-Id": "trace-0001"},
+    )
+    assert resp.headers["X-Trace-Id"] == "trace-0001"
+
+    traces = client.get("/api/traces?limit=5").get_json()
+    turn = next(t for t in traces["traces"] if t["trace_id"] == "trace-0001")
+    assert [span["name"] for span in turn["spans"]][:2] == [
+        f"POST /api/chats/{chat_id}/messages",
+        "chat.turn",
+    ]
+    ui.shutdown_app(app)
+    ui.TRACER.configure(False)
+
+
+def test_each_app_keeps_its_own_tracing_setting(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    traced = ui.create_app(AppConfig(diagnostics=DiagnosticsConfig(trace=True)))
+    quiet = ui.create_app(AppConfig(diagnostics=DiagnosticsConfig(trace=False)))
+
+    traced.test_client().get("/api/chats", headers={"X-Trace-Id": "trace-0002"})
+    quiet.test_client().get("/api/chats", headers={"X-Trace-Id": "trace-0003"})
+    recorded = traced.test_client().get("/api/traces").get_json()
+    assert recorded["enabled"]
+    assert {"trace-0002"} <= {t["trace_id"] for t in recorded["traces"]}
+    assert "trace-0003" not in {t["trace_id"] for t in recorded["traces"]}
+    assert quiet.test_client().get("/api/traces").get_json() == {"enabled": False, "traces": []}
+
+    ui.shutdown_app(traced)
+    assert not ui.TRACER.enabled
+    ui.shutdown_app(quiet)
@@ -1,13 +1,23 @@
+import threading
+
+import pytest
+
 import openclaw_local.ui as ui
 from openclaw_local.config import AppConfig, ModelConfig
+from openclaw_local.scheduler import Interval
+from openclaw_local.tasks import Task
 
 
 class FakeAgent:
-    def __init__(self, config):
+    def __init__(self, config, log=None, affinity=None):
         self.model = config.model.model
+        self.log = log
 
     def ask(self, text: str) -> str:
-        return f"[{self.model}] {text}"
+        reply = f"[{self.model}] {text}"
+        self.log.append("user", text)
+        self.log.append("assistant", reply)
+        return reply
 
     def status(self):
         return {"ok": True, "models": ["llama3", "mistral"], "error": None}
@@ -23,11 +33,152 @@ def test_chat_lifecycle(monkeypatch) -> None:
     assert len(chats) == 1
     chat_id = chats[0]["id"]
 
-    msg_resp = client.post(f"/api/chats/{chat_id}/messages", json={"message": "hello"})
+    msg_resp = client.post(f"/api/chats/{chat_id}/messages", json={"message": "hello", "wait": True})
     assert msg_resp.get_json()["reply"] == "[llama3] hello"
 
     switch_resp = client.post(f"/api/chats/{chat_id}/model", json={"model": "mistral"})
     assert switch_resp.get_json()["ok"] is True
 
-    msg_resp_2 = client.post(f"/api/chats/{chat_id}/messages", json={"message": "again"})
+    msg_resp_2 = client.post(f"/api/chats/{chat_id}/messages", json={"message": "again", "wait": True})
     assert msg_resp_2.get_json()["reply"] == "[mistral] again"
+    ui.shutdown_app(app)
+
+
+def test_chat_sync_since_and_etag(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+
+    list_resp = client.get("/api/chats")
+    etag = list_resp.headers["ETag"]
+    assert client.get("/api/chats", headers={"If-None-Match": etag}).status_code == 304
+
+    chat_id = list_resp.get_json()["chats"][0]["id"]
+    client.post(f"/api/chats/{chat_id}/messages", json={"message": "hello", "wait": True})
+    first = client.get(f"/api/chats/{chat_id}").get_json()
+    assert first["cursor"] == 2
+
+    client.post(f"/api/chats/{chat_id}/messages", json={"message": "again", "wait": True})
+    delta_resp = client.get(f"/api/chats/{chat_id}?since={first['cursor']}")
+    delta = delta_resp.get_json()
+    assert [m["content"] for m in delta["messages"]] == ["again", "[llama3] again"]
+    assert delta["cursor"] == 4
+
+    cached = client.get(
+        f"/api/chats/{chat_id}?since={first['cursor']}",
+        headers={"If-None-Match": delta_resp.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+
+    client.post("/api/chats", json={"title": "Other", "model": "llama3"})
+    assert client.get("/api/chats", headers={"If-None-Match": etag}).status_code == 200
+    ui.shutdown_app(app)
+
+
+def test_chat_message_returns_job(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+    chat_id = client.get("/api/chats").get_json()["chats"][0]["id"]
+
+    resp = client.post(f"/api/chats/{chat_id}/messages", json={"message": "hello"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+
+    result = client.get(f"/api/jobs/{job_id}/result?timeout=5").get_json()
+    assert result["status"] == "done"
+    assert result["reply"] == "[llama3] hello"
+    assert client.get(f"/api/jobs/{job_id}").get_json()["status"] == "done"
+    ui.shutdown_app(app)
+
+
+def test_index_is_served_precompressed_with_etag(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+
+    plain = client.get("/")
+    assert plain.status_code == 200
+    assert b"OpenClaw Local" in plain.data
+    assert plain.headers["Cache-Control"] == "no-cache"
+
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(compressed.data) < len(plain.data)
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    cached = client.get(
+        "/",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+    ui.shutdown_app(app)
+
+
+def test_index_prefers_brotli_when_available(monkeypatch) -> None:
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+
+    plain = client.get("/")
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+    assert compressed.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    cached = client.get(
+        "/",
+        headers={"Accept-Encoding": "br", "If-None-Match": compressed.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+    ui.shutdown_app(app)
+
+
+def test_settings_endpoints_report_failed_jobs(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+    chat_id = client.get("/api/chats").get_json()["chats"][0]["id"]
+    store = app.extensions["openclaw_store"]
+
+    def broken(session, value):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(store, "set_model", broken)
+    monkeypatch.setattr(store, "set_profile", broken)
+    response = client.post(f"/api/chats/{chat_id}/model", json={"model": "mistral"})
+    assert response.status_code == 500
+    assert response.get_json()["ok"] is False
+    response = client.post(f"/api/chats/{chat_id}/profile", json={"profile": "fast"})
+    assert response.status_code == 500
+    ui.shutdown_app(app)
+
+
+def test_shutdown_stops_the_scheduler(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    thread = app.extensions["openclaw_scheduler"]._thread
+    assert thread.is_alive()
+    ui.shutdown_app(app)
+    assert not thread.is_alive()
+
+
+def test_running_tasks_report_progress(monkeypatch) -> None:
+    monkeypatch.setattr(ui, "OpenClawAgent", FakeAgent)
+    app = ui.create_app(AppConfig(model=ModelConfig(model="llama3")))
+    client = app.test_client()
+    started, release = threading.Event(), threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait(5)
+        return "ok"
+
+    app.extensions["openclaw_scheduler"].add(Task("slow", slow), Interval(60), run_now=True)
+    assert started.wait(5)
+    running = client.get("/api/tasks").get_json()["running"]
+    assert running == [{"name": "slow", "total": 1, "running": 1, "finished": 0}]
+
+    release.set()
+    ui.shutdown_app(app)
@@ -1,4 +1,12 @@
-from openclaw_local.vision import VisionService
+import openclaw_local.ui as ui
+from openclaw_local.config import AppConfig
+from openclaw_local.vision import (
+    AdaptiveJpegController,
+    EncoderSettings,
+    LandmarkEncoder,
+    VisionService,
+    VisionSupport,
+)
 
 
 def test_vision_support_false(monkeypatch) -> None:
@@ -14,3 +22,57 @@ def test_vision_support_true(monkeypatch) -> None:
     monkeypatch.setattr("ctypes.util.find_library", lambda name: "libGL.so.1")
     support = VisionService().support()
     assert support.ok is True
+
+
+def test_landmark_encoder_quantize() -> None:
+    encoder = LandmarkEncoder(quantize=100)
+    frame = encoder.encode([[(0.5, 0.25, -0.01)]], timestamp_ms=10)
+    assert frame == {"t": 10, "q": 100, "h": [[50, 25, -1]]}
+
+
+def test_landmark_encoder_delta() -> None:
+    encoder = LandmarkEncoder(quantize=100, delta=True, keyframe_interval=1)
+    first = encoder.encode([[(0.5, 0.5, 0.0)]], timestamp_ms=1)
+    second = encoder.encode([[(0.52, 0.5, 0.0)]], timestamp_ms=2)
+    third = encoder.encode([[(0.53, 0.5, 0.0)]], timestamp_ms=3)
+    assert first["h"] == [[50, 50, 0]]
+    assert second["d"] == [[2, 0, 0]]
+    assert third["h"] == [[53, 50, 0]]
+
+
+def test_adaptive_jpeg_degrades_and_recovers() -> None:
+    controller = AdaptiveJpegController(EncoderSettings(quality=80, encode_budget_ms=10))
+    controller.record(frame_bytes=50_000, encode_ms=40, send_ms=1, frame_width=1280, now=1.0)
+    assert controller.quality == 70
+
+    for _ in range(60):
+        controller.record(frame_bytes=50_000, encode_ms=40, send_ms=1, frame_width=1280)
+    assert controller.quality == AdaptiveJpegController.MIN_QUALITY
+    assert controller.max_width is not None and controller.max_width < 1280
+
+    for _ in range(600):
+        controller.record(frame_bytes=10_000, encode_ms=1, send_ms=1, frame_width=1280)
+    assert controller.max_width is None
+    assert controller.quality == 80
+    assert controller.snapshot()["frames"] == 661
+
+
+def test_video_feed_clamps_encoder_settings(monkeypatch) -> None:
+    captured = []
+    monkeypatch.setattr(ui.VisionService, "support", lambda self: VisionSupport(True, True))
+    monkeypatch.setattr(
+        ui.VisionService,
+        "stream_mjpeg",
+        lambda self, settings: captured.append(settings) or iter([b""]),
+    )
+    app = ui.create_app(AppConfig())
+    client = app.test_client()
+    client.get("/video_feed?max_width=0&kbps=-5&quality=500")
+    client.get("/video_feed")
+    ui.shutdown_app(app)
+
+    clamped, default = captured
+    assert clamped.max_width == AdaptiveJpegController.MIN_WIDTH
+    assert clamped.target_kbps == 64
+    assert clamped.quality == 100
+    assert default.max_width is None and default.target_kbps is None